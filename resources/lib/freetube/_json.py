@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+    JSON serialization shim
+
+    Picks the fastest available JSON codec once at import: orjson
+    (Rust, ~3x stdlib parse speed), then ujson, then stdlib json.
+    Shared by the storage layer and the subscription importers so the
+    fallback chain lives in one place.
+
+    Copyright (C) 2025 FreeTube Kodi Team
+
+    SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+
+from __future__ import absolute_import, division, unicode_literals
+
+import json
+
+try:
+    import orjson
+
+    def json_dumps(value):
+        return orjson.dumps(value).decode('utf-8')
+
+    json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+        json_dumps = ujson.dumps
+        json_loads = ujson.loads
+    except ImportError:
+        json_dumps = json.dumps
+        json_loads = json.loads
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+    Shared Kodi addon handle
+
+    xbmcaddon.Addon() crosses into Kodi's core and reloads the addon
+    metadata each time it is constructed; every module that needs the
+    handle should go through get_addon() so a plugin process builds it
+    exactly once.
+
+    Copyright (C) 2025 FreeTube Kodi Team
+
+    SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+
+from __future__ import absolute_import, division, unicode_literals
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def get_addon():
+    """
+    Get the cached xbmcaddon.Addon instance
+
+    Returns:
+        xbmcaddon.Addon: Shared addon handle
+    """
+    import xbmcaddon
+    return xbmcaddon.Addon()
@@ -8,8 +8,9 @@
 
 from __future__ import absolute_import, division, unicode_literals
 
+from .formats import VideoFormat
 from .innertube import InnertubeClient
 from .invidious import InvidiousClient
 
-__all__ = ['InnertubeClient', 'InvidiousClient']
+__all__ = ['InnertubeClient', 'InvidiousClient', 'VideoFormat']
 
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+    Video Format Record
+
+    Compact record for playable formats parsed from API responses
+    Player responses carry 20+ formats; a __slots__ class halves the
+    per-format memory of the old 12-key dicts
+
+    Copyright (C) 2025 FreeTube Kodi Team
+
+    SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+
+from __future__ import absolute_import, division, unicode_literals
+
+
+class VideoFormat(object):
+    """
+    Single playable format (regular or adaptive)
+    Supports both attribute access and dict-style get() so existing
+    call sites keep working
+    """
+
+    __slots__ = (
+        'itag',
+        'url',
+        'mime_type',
+        'bitrate',
+        'width',
+        'height',
+        'fps',
+        'quality',
+        'quality_label',
+        'audio_quality',
+        'audio_sample_rate',
+        'signature_cipher',
+    )
+
+    def __init__(self, itag=None, url=None, mime_type=None, bitrate=None,
+                 width=None, height=None, fps=None, quality=None,
+                 quality_label=None, audio_quality=None,
+                 audio_sample_rate=None, signature_cipher=None):
+        self.itag = itag
+        self.url = url
+        self.mime_type = mime_type
+        self.bitrate = bitrate
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.quality = quality
+        self.quality_label = quality_label
+        self.audio_quality = audio_quality
+        self.audio_sample_rate = audio_sample_rate
+        self.signature_cipher = signature_cipher
+
+    def get(self, key, default=None):
+        """Dict-style access for call sites written against the old dicts"""
+        return getattr(self, key, default)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __repr__(self):
+        return f'VideoFormat(itag={self.itag}, quality_label={self.quality_label})'
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+    Shared HTTP Session - Connection Pooling
+
+    Single pooled requests.Session shared by all API clients
+    Reuses TCP/TLS connections across calls instead of paying
+    a new handshake per request
+
+    Copyright (C) 2025 FreeTube Kodi Team
+
+    SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+
+from __future__ import absolute_import, division, unicode_literals
+
+import json
+
+# orjson (or ujson) parses large API payloads several times faster than
+# stdlib json and reads bytes directly; fall back silently when neither
+# is available
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+        json_loads = ujson.loads
+    except ImportError:
+        json_loads = json.loads
+
+# Pool sizing: enough per-host connections for a burst of
+# player/browse/search calls without opening a new socket each time
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 8
+
+# The SponsorBlock/DeArrow hosts take a burst of parallel per-video
+# requests during list prefetch; give them deeper, non-blocking pools
+# so the fan-out helpers don't serialize on pool exhaustion
+BULK_HOSTS = (
+    'https://sponsor.ajay.app',
+    'https://dearrow-thumb.ajay.app',
+)
+BULK_POOL_MAXSIZE = 32
+
+_session = None
+
+
+def get_session():
+    """
+    Get the shared HTTP session (lazily created)
+
+    Returns:
+        requests.Session: Shared session with pooled connections
+    """
+    global _session
+
+    if _session is None:
+        try:
+            import requests
+            from requests.adapters import HTTPAdapter
+        except ImportError:
+            raise ImportError('requests module is required')
+
+        # Transparently retry transient 5xx responses with a short
+        # backoff so one gateway hiccup doesn't surface as an error
+        try:
+            from urllib3.util.retry import Retry
+            retries = Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=None,
+            )
+        except ImportError:
+            retries = 0
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=retries
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        bulk_adapter = HTTPAdapter(
+            pool_connections=len(BULK_HOSTS),
+            pool_maxsize=BULK_POOL_MAXSIZE,
+            pool_block=False,
+            max_retries=retries
+        )
+        for host in BULK_HOSTS:
+            session.mount(host, bulk_adapter)
+
+        _session = session
+
+    return _session
+
+
+def map_concurrently(func, items, max_workers=8):
+    """
+    Run func over items on a thread pool, preserving input order
+
+    The per-video fan-out pattern (branding, segments, metadata for a
+    whole list page) is network-bound, so threads sharing the pooled
+    session overlap the round trips instead of paying them serially.
+    Failures are returned as None rather than aborting the batch.
+
+    Args:
+        func: Callable applied to each item
+        items: Iterable of arguments
+        max_workers: Upper bound on concurrent requests
+
+    Returns:
+        list: One result (or None on error) per item, in input order
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    items = list(items)
+    if not items:
+        return []
+
+    def _safe(item):
+        try:
+            return func(item)
+        except Exception:
+            return None
+
+    if len(items) == 1:
+        return [_safe(items[0])]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(_safe, items))
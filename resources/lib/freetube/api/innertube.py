@@ -13,16 +13,11 @@
 from __future__ import absolute_import, division, unicode_literals
 
 import json
+import secrets
+import threading
 import time
-import random
-import string
-from hashlib import sha1
-
-try:
-    from urllib.parse import urlencode, parse_qs, urlparse
-except ImportError:
-    from urllib import urlencode
-    from urlparse import parse_qs, urlparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 try:
     import xbmc
@@ -31,6 +26,32 @@ try:
 except ImportError:
     KODI_MODE = False
 
+from ..cache import get_response_cache
+from .formats import VideoFormat
+
+# orjson decodes the multi-megabyte player/browse payloads much faster
+# than stdlib json; fall back silently when it isn't available
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Prefer Brotli when a decoder is installed - YouTube's br payloads are
+# noticeably smaller than gzip. Pre-importing here keeps the shared
+# object warm before the first response; without a decoder we must not
+# advertise br at all or urllib3 hands back undecoded bytes.
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'br, gzip, deflate'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'br, gzip, deflate'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
 
 class InnertubeClient:
     """
@@ -105,26 +126,57 @@ class InnertubeClient:
         # Session data
         self.api_key = self.API_KEYS.get(client_type, self.API_KEYS['web'])
         self.context = self._create_context()
-        
-        # Request session (use requests library)
-        try:
-            import requests
-            self.session = requests.Session()
-            self._setup_headers()
-        except ImportError:
-            raise ImportError('requests module is required')
+
+        # Endpoint URLs with the API key baked in, filled on first use -
+        # _call_api then skips the concat and key-param merge per call
+        self._endpoint_urls = {}
+
+        # Short-lived player response cache (video_id -> (expiry, response))
+        self._player_cache = {}
+
+        # Parsed pages pre-fetched in the background, keyed by
+        # continuation token and consumed by search()
+        self._continuation_cache = {}
+
+        # In-process memo for repeated reads (key -> (expiry, value));
+        # faster than the disk cache within one long-lived process
+        self._memo = {}
+        
+        # Shared pooled session (reuses TCP/TLS connections across clients)
+        from .http_client import get_session
+        self.session = get_session()
+        self.headers = self._setup_headers()
+
+        # Open the TLS connection early so the first API call doesn't pay
+        # the full handshake
+        self._prewarm_connection()
+
+    def _prewarm_connection(self):
+        """
+        Warm up the keep-alive connection in the background
+        The handshake overlaps with Kodi's UI work before the first call
+        """
+        def _warm():
+            try:
+                self.session.head(self.BASE_URL, headers=self.headers, timeout=5)
+            except Exception:
+                pass
+
+        threading.Thread(target=_warm, daemon=True).start()
     
     def _create_context(self):
         """
         Create API context (no authentication needed)
         This mimics FreeTube's approach: create fresh session without login
         """
-        client_info = self.CLIENTS.get(self.client_type, self.CLIENTS['web']).copy()
-        
-        # Generate visitor data (anonymous identifier)
-        visitor_data = self._generate_visitor_data()
-        
-        context = {
+        # Invariant part is memoized per (client_type, language, region);
+        # only the per-instance visitor data is added on top
+        client_info = dict(_cached_client_info(self.client_type, self.language, self.region))
+
+        # Add visitor data for tracking prevention
+        client_info['visitorData'] = self._generate_visitor_data()
+
+        return {
             'client': client_info,
             'request': {
                 'useSsl': self.use_https,
@@ -135,123 +187,160 @@ class InnertubeClient:
                 # No authentication - key difference from official clients
             },
         }
-        
-        # Add language/region
-        if self.language:
-            context['client']['hl'] = self.language
-        if self.region:
-            context['client']['gl'] = self.region
-        
-        # Add visitor data for tracking prevention
-        context['client']['visitorData'] = visitor_data
-        
-        return context
     
     def _generate_visitor_data(self):
         """
         Generate anonymous visitor data
         This is used instead of authentication
         """
-        # Simple random string generation (11 chars base64-like)
-        chars = string.ascii_letters + string.digits + '-_'
-        return ''.join(random.choice(chars) for _ in range(11))
+        # One OS CSPRNG call, already URL-safe base64 (11 chars)
+        return secrets.token_urlsafe(9)[:11]
     
     def _setup_headers(self):
         """
-        Setup HTTP headers to mimic FreeTube's requests
+        Build HTTP headers to mimic FreeTube's requests
         Key headers for bypassing authentication checks
+
+        Returns:
+            dict: Request headers for this client (memoized, do not mutate)
         """
-        # User agent based on client type
-        user_agents = {
-            'web': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-            'mweb': 'Mozilla/5.0 (Linux; Android 14) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.6778.39 Mobile Safari/537.36',
-            'android': 'com.google.android.youtube/19.15.36 (Linux; U; Android 14) gzip',
-            'ios': 'com.google.ios.youtube/19.15.1 (iPhone15,2; U; CPU iOS 17_5_1 like Mac OS X)',
-        }
-        
-        headers = {
-            'User-Agent': user_agents.get(self.client_type, user_agents['web']),
-            'Accept-Language': f'{self.language},en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Origin': self.BASE_URL,
-            'Referer': self.BASE_URL + '/',
-        }
-        
-        # Critical headers for non-authenticated access (from FreeTube)
-        if self.client_type in ['web', 'mweb']:
-            headers.update({
-                'Sec-Fetch-Site': 'same-origin',
-                'Sec-Fetch-Mode': 'same-origin',
-                'X-Youtube-Bootstrap-Logged-In': 'false',  # KEY: Tell YouTube we're not logged in
-                'X-Youtube-Client-Name': '1' if self.client_type == 'web' else '2',
-                'X-Youtube-Client-Version': self.CLIENTS[self.client_type]['clientVersion'],
-            })
-        
-        self.session.headers.update(headers)
+        return _cached_headers(self.client_type, self.language)
     
-    def _call_api(self, endpoint, data=None, params=None):
+    def _call_api(self, endpoint, data=None, params=None, cache_key=None):
         """
         Make API call to Innertube endpoint
-        
+
         Args:
             endpoint: API endpoint (e.g., 'player', 'browse', 'search')
             data: POST data dictionary
             params: URL parameters
-            
+            cache_key: Persistent cache key (optional, enables disk cache)
+
         Returns:
             dict: API response
         """
-        url = f'{self.API_BASE}/{endpoint}'
-        
-        # Add API key to URL
-        url_params = {'key': self.api_key}
-        if params:
-            url_params.update(params)
-        
+        # Serve repeat navigation from the on-disk cache
+        if cache_key:
+            cached = get_response_cache().get(cache_key)
+            if cached is not None:
+                return cached
+
+        url = self._endpoint_urls.get(endpoint)
+        if url is None:
+            url = self._endpoint_urls[endpoint] = f'{self.API_BASE}/{endpoint}?key={self.api_key}'
+
         # Prepare request data
         if data is None:
             data = {}
-        
+
         # Always include context
         data['context'] = self.context
-        
+
         try:
             # Make POST request (Innertube API uses POST for everything)
-            response = self.session.post(
+            with self.session.post(
                 url,
-                params=url_params,
+                params=params,
                 json=data,
-                timeout=30
-            )
-            
-            response.raise_for_status()
-            return response.json()
+                headers=self.headers,
+                timeout=30,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+
+                # Drain the body in large chunks - far fewer Python-level
+                # iterations than requests' default 10 KB content join on
+                # multi-megabyte player/browse payloads, and the socket
+                # keeps filling while we append
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=65536):
+                    body += chunk
+
+            # Decode the raw bytes directly - skips requests' charset
+            # detection and lets orjson parse the payload when installed
+            result = _json_loads(body)
+
+            if cache_key:
+                get_response_cache().set(cache_key, result)
+
+            return result
             
         except Exception as e:
             if KODI_MODE:
                 xbmc.log(f'[FreeTube] Innertube API error: {str(e)}', xbmc.LOGERROR)
             raise
     
+    # Player responses stay valid for a few minutes - long enough for
+    # back-navigation to the same video to skip the network round trip
+    PLAYER_CACHE_TTL = 300
+
+    def _get_player_response(self, video_id):
+        """Call the player endpoint with a short-lived per-video cache"""
+        now = time.monotonic()
+
+        cached = self._player_cache.get(video_id)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        response = self._call_api('player', data={
+            'videoId': video_id,
+            'contentCheckOk': True,
+            'racyCheckOk': True,
+        })
+
+        # Drop expired entries before caching so the dict stays small
+        if len(self._player_cache) >= 16:
+            self._player_cache = {
+                vid: entry for vid, entry in self._player_cache.items()
+                if entry[0] > now
+            }
+        self._player_cache[video_id] = (now + self.PLAYER_CACHE_TTL, response)
+
+        return response
+
+    def _cache_key(self, kind, *parts):
+        """Build a disk-cache key scoped to this client configuration"""
+        return '|'.join(('innertube', kind, self.client_type, self.language,
+                         self.region) + parts)
+
     def get_video_info(self, video_id):
         """
         Get video information without authentication
-        
+
         Args:
             video_id: YouTube video ID
-            
+
         Returns:
             dict: Video information including streams
         """
-        data = {
-            'videoId': video_id,
-            'contentCheckOk': True,
-            'racyCheckOk': True,
-        }
-        
-        # Call player endpoint
-        response = self._call_api('player', data=data)
-        
-        return self._parse_video_info(response)
+        return self._parse_video_info(self._get_player_response(video_id))
+
+    def get_video_bundle(self, video_id):
+        """
+        Get video information and related videos in one go
+
+        The player and next endpoints are independent, so both requests
+        are issued concurrently on the shared keep-alive pool - the
+        video-detail screen pays max(RTT) instead of sum(RTT).
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            dict: {'info': video info dict, 'related': list of related items}
+        """
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            player_future = pool.submit(self._get_player_response, video_id)
+            next_future = pool.submit(self._call_api, 'next', {'videoId': video_id})
+
+            info = self._parse_video_info(player_future.result())
+
+            try:
+                related = self._parse_search_results(next_future.result())['items']
+            except Exception:
+                related = []
+
+        return {'info': info, 'related': related}
     
     def _parse_video_info(self, response):
         """
@@ -303,20 +392,21 @@ class InnertubeClient:
     
     def _parse_format(self, fmt):
         """Parse a single format object"""
-        return {
-            'itag': fmt.get('itag'),
-            'url': fmt.get('url'),
-            'mime_type': fmt.get('mimeType'),
-            'bitrate': fmt.get('bitrate'),
-            'width': fmt.get('width'),
-            'height': fmt.get('height'),
-            'fps': fmt.get('fps'),
-            'quality': fmt.get('quality'),
-            'quality_label': fmt.get('qualityLabel'),
-            'audio_quality': fmt.get('audioQuality'),
-            'audio_sample_rate': fmt.get('audioSampleRate'),
-            'signature_cipher': fmt.get('signatureCipher'),
-        }
+        get = fmt.get
+        return VideoFormat(
+            itag=get('itag'),
+            url=get('url'),
+            mime_type=get('mimeType'),
+            bitrate=get('bitrate'),
+            width=get('width'),
+            height=get('height'),
+            fps=get('fps'),
+            quality=get('quality'),
+            quality_label=get('qualityLabel'),
+            audio_quality=get('audioQuality'),
+            audio_sample_rate=get('audioSampleRate'),
+            signature_cipher=get('signatureCipher'),
+        )
     
     def search(self, query, continuation=None):
         """
@@ -330,168 +420,276 @@ class InnertubeClient:
             dict: Search results
         """
         if continuation:
-            # Continue previous search
-            data = {'continuation': continuation}
-            response = self._call_api('search', data=data)
+            # Page may already be parsed by a background prefetch
+            prefetched = self._continuation_cache.pop(continuation, None)
+            if prefetched is not None:
+                return prefetched
+
+            response = self._call_api('search', data={'continuation': continuation})
         else:
-            # New search
-            data = {'query': query}
-            response = self._call_api('search', data=data)
-        
+            # New search (first pages repeat often - cache on disk)
+            response = self._call_api(
+                'search',
+                data={'query': query},
+                cache_key=self._cache_key('search', query)
+            )
+
         return self._parse_search_results(response)
-    
+
+    def prefetch_search(self, query, pages=3):
+        """
+        Pre-fetch upcoming search result pages in the background
+
+        Continuation tokens are serial - each page's token comes from the
+        previous response - so the pages are walked in order on a shared
+        bounded worker pool while the UI renders page one. Scrolling then
+        consumes the already-parsed pages from memory via search().
+
+        Args:
+            query: Search query string
+            pages: Total number of pages to have ready
+        """
+        def _walk():
+            try:
+                results = self.search(query)
+                for _ in range(pages - 1):
+                    token = results.get('continuation')
+                    if not token:
+                        break
+                    results = self._parse_search_results(
+                        self._call_api('search', data={'continuation': token})
+                    )
+                    if len(self._continuation_cache) >= 12:
+                        self._continuation_cache.clear()
+                    self._continuation_cache[token] = results
+            except Exception:
+                # Prefetching is opportunistic - the foreground search
+                # path will simply fetch the page itself
+                pass
+
+        return _prefetch_pool().submit(_walk)
+
+    # Subtrees of browse/search responses that can actually contain
+    # renderers - everything else (responseContext, frameworkUpdates,
+    # topbar, trackingParams blobs) is never read and not worth walking
+    CONTENT_KEYS = (
+        'contents',
+        'continuationContents',
+        'onResponseReceivedCommands',
+        'onResponseReceivedActions',
+        'onResponseReceivedEndpoints',
+    )
+
+    def _content_roots(self, response):
+        """Select the renderer-bearing subtrees of a response"""
+        roots = [response[key] for key in self.CONTENT_KEYS if key in response]
+        return roots if roots else response
+
     def _parse_search_results(self, response):
         """Parse search results"""
-        results = {
-            'items': [],
-            'continuation': None,
+        items = []
+        continuation = None
+
+        parsers = {
+            'videoRenderer': self._parse_video_renderer,
+            'channelRenderer': self._parse_channel_renderer,
+            'playlistRenderer': self._parse_playlist_renderer,
+        }
+        wanted = ('continuationCommand', 'videoRenderer', 'channelRenderer',
+                  'playlistRenderer')
+
+        # One fused traversal for all renderer types plus the
+        # continuation token; items come out in YouTube's displayed
+        # order instead of grouped by type
+        for key, value in _collect_keys(self._content_roots(response), wanted):
+            if key == 'continuationCommand':
+                if continuation is None:
+                    continuation = value.get('token')
+            else:
+                # One structurally odd renderer shouldn't abort the
+                # whole page - skip it and keep the rest
+                try:
+                    item = parsers[key](value)
+                except Exception:
+                    continue
+                if item:
+                    items.append(item)
+
+        return {
+            'items': items,
+            'continuation': continuation,
         }
-        
-        # Extract continuation token
-        continuation_items = self._find_in_dict(response, 'continuationCommand')
-        if continuation_items:
-            results['continuation'] = continuation_items[0].get('token')
-        
-        # Extract videos
-        video_renderers = self._find_in_dict(response, 'videoRenderer')
-        for renderer in video_renderers:
-            item = self._parse_video_renderer(renderer)
-            if item:
-                results['items'].append(item)
-        
-        # Extract channels
-        channel_renderers = self._find_in_dict(response, 'channelRenderer')
-        for renderer in channel_renderers:
-            item = self._parse_channel_renderer(renderer)
-            if item:
-                results['items'].append(item)
-        
-        # Extract playlists
-        playlist_renderers = self._find_in_dict(response, 'playlistRenderer')
-        for renderer in playlist_renderers:
-            item = self._parse_playlist_renderer(renderer)
-            if item:
-                results['items'].append(item)
-        
-        return results
     
     def _parse_video_renderer(self, renderer):
         """Parse video renderer object"""
-        try:
-            video_id = renderer.get('videoId')
-            if not video_id:
-                return None
-            
-            title_runs = renderer.get('title', {}).get('runs', [])
-            title = title_runs[0].get('text') if title_runs else ''
-            
-            return {
-                'type': 'video',
-                'video_id': video_id,
-                'title': title,
-                'author': self._get_text(renderer, 'ownerText'),
-                'channel_id': self._get_navigation_endpoint(renderer, 'ownerText', 'browseId'),
-                'duration': self._get_text(renderer, 'lengthText'),
-                'view_count': self._get_text(renderer, 'viewCountText'),
-                'published': self._get_text(renderer, 'publishedTimeText'),
-                'thumbnails': renderer.get('thumbnail', {}).get('thumbnails', []),
-            }
-        except Exception:
+        # Hot path: local bindings avoid repeated attribute lookups and
+        # the per-item exception frame the old wrapper paid for
+        get = renderer.get
+        text = _renderer_text
+
+        video_id = get('videoId')
+        if not video_id:
             return None
-    
+
+        title_runs = get('title', {}).get('runs')
+        title = title_runs[0].get('text') if title_runs else ''
+
+        return {
+            'type': 'video',
+            'video_id': video_id,
+            'title': title,
+            'author': text(get('ownerText')),
+            'channel_id': self._get_navigation_endpoint(renderer, 'ownerText', 'browseId'),
+            'duration': text(get('lengthText')),
+            'view_count': text(get('viewCountText')),
+            'published': text(get('publishedTimeText')),
+            'thumbnails': get('thumbnail', {}).get('thumbnails', []),
+        }
+
     def _parse_channel_renderer(self, renderer):
         """Parse channel renderer object"""
-        try:
-            return {
-                'type': 'channel',
-                'channel_id': renderer.get('channelId'),
-                'title': self._get_text(renderer, 'title'),
-                'description': self._get_text(renderer, 'descriptionSnippet'),
-                'subscriber_count': self._get_text(renderer, 'subscriberCountText'),
-                'thumbnails': renderer.get('thumbnail', {}).get('thumbnails', []),
-            }
-        except Exception:
+        get = renderer.get
+        text = _renderer_text
+
+        channel_id = get('channelId')
+        if not channel_id:
             return None
-    
+
+        return {
+            'type': 'channel',
+            'channel_id': channel_id,
+            'title': text(get('title')),
+            'description': text(get('descriptionSnippet')),
+            'subscriber_count': text(get('subscriberCountText')),
+            'thumbnails': get('thumbnail', {}).get('thumbnails', []),
+        }
+
     def _parse_playlist_renderer(self, renderer):
         """Parse playlist renderer object"""
-        try:
-            return {
-                'type': 'playlist',
-                'playlist_id': renderer.get('playlistId'),
-                'title': self._get_text(renderer, 'title'),
-                'video_count': self._get_text(renderer, 'videoCountText'),
-                'thumbnails': renderer.get('thumbnails', [{}])[0].get('thumbnails', []),
-            }
-        except Exception:
+        get = renderer.get
+        text = _renderer_text
+
+        playlist_id = get('playlistId')
+        if not playlist_id:
             return None
+
+        return {
+            'type': 'playlist',
+            'playlist_id': playlist_id,
+            'title': text(get('title')),
+            'video_count': text(get('videoCountText')),
+            'thumbnails': get('thumbnails', [{}])[0].get('thumbnails', []),
+        }
     
+    # In-process memo lifetime for channel info, trending and suggestions
+    MEMO_TTL = 300
+
+    def _memo_get(self, key):
+        """Get a live entry from the in-process memo"""
+        entry = self._memo.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _memo_set(self, key, value):
+        """Store an entry in the in-process memo, evicting expired ones"""
+        now = time.monotonic()
+        if len(self._memo) >= 32:
+            self._memo = {
+                k: entry for k, entry in self._memo.items() if entry[0] > now
+            }
+        self._memo[key] = (now + self.MEMO_TTL, value)
+
     def get_channel_info(self, channel_id):
         """Get channel information"""
-        data = {'browseId': channel_id}
-        response = self._call_api('browse', data=data)
+        cached = self._memo_get(('channel_info', channel_id))
+        if cached is not None:
+            return cached
+
+        response = self._call_api('browse', data={'browseId': channel_id})
+        self._memo_set(('channel_info', channel_id), response)
         return response
     
     def get_channel_videos(self, channel_id, continuation=None):
         """Get channel videos"""
         if continuation:
             data = {'continuation': continuation}
+            cache_key = None
         else:
             # Videos tab params (protobuf encoded)
             data = {
                 'browseId': channel_id,
                 'params': 'EgZ2aWRlb3PyBgQKAjoA',  # Videos tab
             }
-        
-        response = self._call_api('browse', data=data)
+            cache_key = self._cache_key('channel_videos', channel_id)
+
+        response = self._call_api('browse', data=data, cache_key=cache_key)
         return self._parse_search_results(response)
-    
+
     def get_playlist(self, playlist_id, continuation=None):
         """Get playlist videos"""
         if continuation:
             data = {'continuation': continuation}
+            cache_key = None
         else:
             data = {'browseId': f'VL{playlist_id}'}
-        
-        response = self._call_api('browse', data=data)
+            cache_key = self._cache_key('playlist', playlist_id)
+
+        response = self._call_api('browse', data=data, cache_key=cache_key)
         return self._parse_search_results(response)
-    
+
     def get_trending(self):
         """Get trending videos"""
-        data = {'browseId': 'FEtrending'}
-        response = self._call_api('browse', data=data)
-        return self._parse_search_results(response)
-    
+        cached = self._memo_get(('trending',))
+        if cached is not None:
+            return cached
+
+        response = self._call_api(
+            'browse',
+            data={'browseId': 'FEtrending'},
+            cache_key=self._cache_key('trending')
+        )
+        results = self._parse_search_results(response)
+        self._memo_set(('trending',), results)
+        return results
+
+    def ping(self):
+        """
+        Lightweight liveness probe
+
+        One HEAD to the base URL over the pooled session - a handful
+        of bytes on the wire, unlike fetching and parsing a whole
+        trending page just to learn whether YouTube is reachable.
+
+        Returns:
+            bool: True if YouTube answered
+        """
+        try:
+            response = self.session.head(self.BASE_URL, headers=self.headers, timeout=5)
+            return response.status_code < 500
+        except Exception:
+            return False
+
     def get_search_suggestions(self, query):
         """Get search suggestions"""
+        cached = self._memo_get(('suggestions', query))
+        if cached is not None:
+            return cached
+
         data = {'input': query}
         response = self._call_api('music/get_search_suggestions', data=data)
-        
+
         suggestions = []
-        for item in self._find_in_dict(response, 'searchSuggestionRenderer'):
+        for item in _find_in_dict(response, 'searchSuggestionRenderer'):
             suggestion = self._get_text(item, 'suggestion')
             if suggestion:
                 suggestions.append(suggestion)
-        
+
+        self._memo_set(('suggestions', query), suggestions)
         return suggestions
     
     # Helper methods
-    
-    def _find_in_dict(self, data, key):
-        """Recursively find all occurrences of a key in nested dict/list"""
-        results = []
-        
-        if isinstance(data, dict):
-            if key in data:
-                results.append(data[key])
-            for value in data.values():
-                results.extend(self._find_in_dict(value, key))
-        elif isinstance(data, list):
-            for item in data:
-                results.extend(self._find_in_dict(item, key))
-        
-        return results
-    
+
     def _get_text(self, data, key):
         """Extract text from renderer object"""
         try:
@@ -517,3 +715,172 @@ class InnertubeClient:
         except Exception:
             return None
 
+
+# Bounded worker pool shared by all prefetchers - bursts never open more
+# than four concurrent sockets on top of the foreground request
+_prefetch_executor = None
+
+
+def _prefetch_pool():
+    """Get the shared prefetch pool (lazily created)"""
+    global _prefetch_executor
+
+    if _prefetch_executor is None:
+        _prefetch_executor = ThreadPoolExecutor(max_workers=4)
+
+    return _prefetch_executor
+
+
+# The tree walkers live at module level: they are called thousands of
+# times per response and plain functions skip the bound-method dispatch
+# that an instance method pays on every call. (AOT-compiling them was
+# considered, but a Kodi addon is distributed as pure Python for every
+# architecture, so shipping .so builds is not an option.)
+
+# Branches that can never contain a renderer - mostly tracking and
+# accessibility blobs. Pruning them skips the bulk of the tree.
+_SKIP_KEYS = frozenset({
+    'trackingParams',
+    'clickTrackingParams',
+    'loggingDirectives',
+    'accessibility',
+    'accessibilityData',
+    'adPayload',
+    'adPlacementConfig',
+    'responseContext',
+    'frameworkUpdates',
+})
+
+
+def _find_in_dict(data, key):
+    """
+    Find all occurrences of a key in nested dict/list
+
+    Walks the tree iteratively with an explicit stack - Innertube
+    responses have tens of thousands of nodes and recursion frames
+    dominate the parse time. Known tracking/accessibility branches
+    are pruned up front. Matches are returned in the same pre-order
+    as the old recursive walk.
+    """
+    results = []
+    stack = [data]
+    pop = stack.pop
+    extend = stack.extend
+
+    while stack:
+        node = pop()
+
+        if isinstance(node, dict):
+            if key in node:
+                results.append(node[key])
+            children = [
+                v for k, v in node.items()
+                if k not in _SKIP_KEYS and isinstance(v, (dict, list))
+            ]
+        elif isinstance(node, list):
+            children = [v for v in node if isinstance(v, (dict, list))]
+        else:
+            continue
+
+        # Reverse so the LIFO stack visits siblings in document order
+        children.reverse()
+        extend(children)
+
+    return results
+
+
+def _collect_keys(data, keys):
+    """
+    Collect several keys from nested dict/list in one traversal
+
+    Same pruned iterative walk as _find_in_dict, but matches for all
+    requested keys are emitted as (key, value) pairs in a single
+    pre-order pass over the tree.
+    """
+    found = []
+    stack = [data]
+    pop = stack.pop
+    extend = stack.extend
+
+    while stack:
+        node = pop()
+
+        if isinstance(node, dict):
+            for key in keys:
+                if key in node:
+                    found.append((key, node[key]))
+            children = [
+                v for k, v in node.items()
+                if k not in _SKIP_KEYS and isinstance(v, (dict, list))
+            ]
+        elif isinstance(node, list):
+            children = [v for v in node if isinstance(v, (dict, list))]
+        else:
+            continue
+
+        children.reverse()
+        extend(children)
+
+    return found
+
+
+def _renderer_text(text_data):
+    """
+    Extract display text from a renderer text object
+
+    Hot-path variant of _get_text: takes the text object directly and
+    avoids the try/except and extra dict lookup per call.
+    """
+    if not text_data:
+        return ''
+    runs = text_data.get('runs')
+    if runs:
+        return ''.join(run.get('text', '') for run in runs)
+    return text_data.get('simpleText', '')
+
+
+# User agent per client type (mimics real browser/app)
+USER_AGENTS = {
+    'web': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'mweb': 'Mozilla/5.0 (Linux; Android 14) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.6778.39 Mobile Safari/537.36',
+    'android': 'com.google.android.youtube/19.15.36 (Linux; U; Android 14) gzip',
+    'ios': 'com.google.ios.youtube/19.15.1 (iPhone15,2; U; CPU iOS 17_5_1 like Mac OS X)',
+}
+
+
+@lru_cache(maxsize=16)
+def _cached_client_info(client_type, language, region):
+    """Build the invariant client info dict once per configuration"""
+    client_info = InnertubeClient.CLIENTS.get(client_type, InnertubeClient.CLIENTS['web']).copy()
+
+    if language:
+        client_info['hl'] = language
+    if region:
+        client_info['gl'] = region
+
+    return client_info
+
+
+@lru_cache(maxsize=16)
+def _cached_headers(client_type, language):
+    """Build request headers once per configuration"""
+    headers = {
+        'User-Agent': USER_AGENTS.get(client_type, USER_AGENTS['web']),
+        'Accept-Language': f'{language},en;q=0.9',
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'Origin': InnertubeClient.BASE_URL,
+        'Referer': InnertubeClient.BASE_URL + '/',
+    }
+
+    # Critical headers for non-authenticated access (from FreeTube)
+    if client_type in ['web', 'mweb']:
+        headers.update({
+            'Sec-Fetch-Site': 'same-origin',
+            'Sec-Fetch-Mode': 'same-origin',
+            'X-Youtube-Bootstrap-Logged-In': 'false',  # KEY: Tell YouTube we're not logged in
+            'X-Youtube-Client-Name': '1' if client_type == 'web' else '2',
+            'X-Youtube-Client-Version': InnertubeClient.CLIENTS[client_type]['clientVersion'],
+        })
+
+    return headers
+
@@ -12,8 +12,9 @@
 
 from __future__ import absolute_import, division, unicode_literals
 
-import json
 import random
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 try:
     from urllib.parse import urlencode, quote
@@ -26,6 +27,16 @@ try:
 except ImportError:
     KODI_MODE = False
 
+from .formats import VideoFormat
+from .http_client import get_session, json_loads
+
+# Matches the scheme + googlevideo host prefix of a stream URL
+_GOOGLEVIDEO_RE = re.compile(r'^https?://[^/]*googlevideo\.com')
+
+# YouTube video ids are exactly 11 URL-safe base64 chars; rejecting
+# malformed ids locally saves a guaranteed-404 round trip
+_VALID_VIDEO_ID = re.compile(r'^[A-Za-z0-9_-]{11}$').match
+
 
 class InvidiousClient:
     """
@@ -34,7 +45,8 @@ class InvidiousClient:
     """
     
     # Default public Invidious instances (from FreeTube's list)
-    DEFAULT_INSTANCES = [
+    # Tuple: immutable, so no defensive copies are needed
+    DEFAULT_INSTANCES = (
         'https://inv.nadeko.net',
         'https://invidious.private.coffee',
         'https://yt.artemislena.eu',
@@ -45,7 +57,7 @@ class InvidiousClient:
         'https://invidious.asir.dev',
         'https://iv.ggtyler.dev',
         'https://invidious.io.lol',
-    ]
+    )
     
     def __init__(self, instance_url=None, random_instance=True):
         """
@@ -58,20 +70,23 @@ class InvidiousClient:
         if instance_url:
             self.instance_url = instance_url.rstrip('/')
         elif random_instance:
-            self.instance_url = random.choice(self.DEFAULT_INSTANCES)
+            self.instance_url = self.DEFAULT_INSTANCES[random.randrange(len(self.DEFAULT_INSTANCES))]
         else:
             self.instance_url = self.DEFAULT_INSTANCES[0]
         
-        # Request session
-        try:
-            import requests
-            self.session = requests.Session()
-            self.session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            })
-        except ImportError:
-            raise ImportError('requests module is required')
-    
+        # Shared pooled session (reuses TCP/TLS connections across clients)
+        self.session = get_session()
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        }
+
+        # Circuit breaker: rotate away from a dead instance instead of
+        # paying a fresh timeout on every subsequent call
+        self._consecutive_failures = 0
+
+    # Consecutive _call_api failures before rotating instances
+    FAILURE_THRESHOLD = 3
+
     def _call_api(self, endpoint, params=None):
         """
         Make API call to Invidious instance
@@ -86,14 +101,37 @@ class InvidiousClient:
         url = f'{self.instance_url}/api/v1/{endpoint}'
         
         try:
-            response = self.session.get(url, params=params, timeout=30)
+            response = self.session.get(url, params=params, headers=self.headers, timeout=30)
             response.raise_for_status()
-            return response.json()
-            
+            self._consecutive_failures = 0
+            return json_loads(response.content)
+
         except Exception as e:
             if KODI_MODE:
                 xbmc.log(f'[FreeTube] Invidious API error: {str(e)}', xbmc.LOGERROR)
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self.FAILURE_THRESHOLD:
+                self._rotate_instance()
             raise
+
+    def _rotate_instance(self):
+        """
+        Switch to a known-working instance after repeated failures
+
+        Probes the instance list and points this client at the first
+        healthy one, so the next call doesn't burn another timeout on
+        an instance that is clearly down.
+        """
+        self._consecutive_failures = 0
+        replacement = self.find_working_instance(timeout=5)
+        if replacement and replacement.instance_url != self.instance_url:
+            if KODI_MODE:
+                xbmc.log(
+                    f'[FreeTube] Rotating Invidious instance '
+                    f'{self.instance_url} -> {replacement.instance_url}',
+                    xbmc.LOGINFO
+                )
+            self.instance_url = replacement.instance_url
     
     def get_video_info(self, video_id):
         """
@@ -103,69 +141,50 @@ class InvidiousClient:
             video_id: YouTube video ID
             
         Returns:
-            dict: Video information
+            dict: Video information, or None for a malformed id
         """
+        if not video_id or not _VALID_VIDEO_ID(video_id):
+            return None
+
         response = self._call_api(f'videos/{video_id}')
         return self._parse_video_info(response)
     
     def _parse_video_info(self, data):
         """Parse Invidious video info to standard format"""
+        get = data.get
         info = {
-            'video_id': data.get('videoId'),
-            'title': data.get('title'),
-            'author': data.get('author'),
-            'channel_id': data.get('authorId'),
-            'length_seconds': data.get('lengthSeconds', 0),
-            'is_live': data.get('liveNow', False),
-            'short_description': data.get('description', ''),
-            'view_count': data.get('viewCount', 0),
-            'published': data.get('published', 0),
-            'thumbnails': data.get('videoThumbnails', []),
+            'video_id': get('videoId'),
+            'title': get('title'),
+            'author': get('author'),
+            'channel_id': get('authorId'),
+            'length_seconds': get('lengthSeconds', 0),
+            'is_live': get('liveNow', False),
+            'short_description': get('description', ''),
+            'view_count': get('viewCount', 0),
+            'published': get('published', 0),
+            'thumbnails': get('videoThumbnails', []),
         }
-        
-        # Parse formats
-        formats = []
-        adaptive_formats = []
-        
-        for fmt in data.get('formatStreams', []):
-            formats.append({
-                'itag': fmt.get('itag'),
-                'url': self._get_proxied_url(fmt.get('url')),
-                'mime_type': f"{fmt.get('type')}/{fmt.get('container')}",
-                'quality': fmt.get('quality'),
-                'quality_label': fmt.get('qualityLabel'),
-                'fps': fmt.get('fps'),
-                'bitrate': fmt.get('bitrate'),
-                'width': fmt.get('size', '').split('x')[0] if 'x' in fmt.get('size', '') else None,
-                'height': fmt.get('size', '').split('x')[1] if 'x' in fmt.get('size', '') else None,
-            })
-        
-        for fmt in data.get('adaptiveFormats', []):
-            adaptive_formats.append({
-                'itag': fmt.get('itag'),
-                'url': self._get_proxied_url(fmt.get('url')),
-                'mime_type': f"{fmt.get('type')}/{fmt.get('container')}",
-                'quality': fmt.get('quality'),
-                'quality_label': fmt.get('qualityLabel'),
-                'fps': fmt.get('fps'),
-                'bitrate': fmt.get('bitrate'),
-                'audio_quality': fmt.get('audioQuality'),
-                'audio_sample_rate': fmt.get('audioSampleRate'),
-                'width': fmt.get('size', '').split('x')[0] if 'x' in fmt.get('size', '') else None,
-                'height': fmt.get('size', '').split('x')[1] if 'x' in fmt.get('size', '') else None,
-            })
-        
-        info['formats'] = formats
-        info['adaptive_formats'] = adaptive_formats
-        
+
+        # Parse formats - one field extraction pass per entry via the
+        # shared helper instead of re-reading source keys per target field
+        proxy = self._get_proxied_url
+        info['formats'] = [
+            _extract_format(fmt, proxy)
+            for fmt in get('formatStreams', [])
+        ]
+        info['adaptive_formats'] = [
+            _extract_format(fmt, proxy, adaptive=True)
+            for fmt in get('adaptiveFormats', [])
+        ]
+
         # HLS manifest for live streams
-        if data.get('hlsUrl'):
-            info['hls_manifest_url'] = self._get_proxied_url(data['hlsUrl'])
-        
+        if get('hlsUrl'):
+            info['hls_manifest_url'] = proxy(data['hlsUrl'])
+
         # DASH manifest
-        if data.get('dashUrl'):
-            info['dash_manifest_url'] = self._get_proxied_url(data['dashUrl'])
-        
+        if get('dashUrl'):
+            info['dash_manifest_url'] = proxy(data['dashUrl'])
+
         return info
     
     def _get_proxied_url(self, url):
@@ -180,20 +199,18 @@ class InvidiousClient:
         """
         if not url:
             return url
-        
+
         # If URL is already proxied, return as is
         if url.startswith(self.instance_url):
             return url
-        
-        # Proxy through Invidious
-        from urllib.parse import urlparse
-        parsed = urlparse(url)
-        
-        # Add host parameter for Invidious proxy
-        if 'googlevideo.com' in parsed.netloc:
-            # YouTube video servers need special handling
-            return url.replace(parsed.scheme + '://' + parsed.netloc, self.instance_url)
-        
+
+        # YouTube video servers need special handling - swap the
+        # googlevideo host for the Invidious proxy. The compiled regex
+        # replaces a full urlparse per format URL (30+ per video).
+        match = _GOOGLEVIDEO_RE.match(url)
+        if match:
+            return self.instance_url + url[match.end():]
+
         return url
     
     def search(self, query, page=1, sort_by='relevance', date='', duration='', type='all'):
@@ -211,68 +228,53 @@ class InvidiousClient:
         Returns:
             dict: Search results
         """
+        response = self._call_api(
+            'search',
+            params=self._search_params(query, page, sort_by, date, duration, type)
+        )
+        return self._parse_search_results(response)
+
+    def search_iter(self, query, page=1, sort_by='relevance', date='', duration='', type='all'):
+        """
+        Search on Invidious, yielding items lazily
+
+        Same parameters as search(), but items are converted one at a
+        time as the caller consumes them, so building Kodi list items
+        can start without materializing the whole result list first.
+
+        Returns:
+            generator: Parsed search result items
+        """
+        response = self._call_api(
+            'search',
+            params=self._search_params(query, page, sort_by, date, duration, type)
+        )
+        return _iter_search_items(response)
+
+    @staticmethod
+    def _search_params(query, page, sort_by, date, duration, type):
+        """Build the query parameters for a search call"""
         params = {
             'q': query,
             'page': page,
             'sort_by': sort_by,
         }
-        
+
         if date:
             params['date'] = date
         if duration:
             params['duration'] = duration
         if type != 'all':
             params['type'] = type
-        
-        response = self._call_api('search', params=params)
-        return self._parse_search_results(response)
-    
+
+        return params
+
     def _parse_search_results(self, data):
         """Parse Invidious search results"""
-        results = {
-            'items': [],
+        return {
+            'items': list(_iter_search_items(data)),
             'continuation': None,
         }
-        
-        for item in data:
-            item_type = item.get('type')
-            
-            if item_type == 'video':
-                results['items'].append({
-                    'type': 'video',
-                    'video_id': item.get('videoId'),
-                    'title': item.get('title'),
-                    'author': item.get('author'),
-                    'channel_id': item.get('authorId'),
-                    'duration': item.get('lengthSeconds'),
-                    'view_count': item.get('viewCount'),
-                    'published': item.get('publishedText'),
-                    'thumbnails': item.get('videoThumbnails', []),
-                    'live': item.get('liveNow', False),
-                })
-            
-            elif item_type == 'channel':
-                results['items'].append({
-                    'type': 'channel',
-                    'channel_id': item.get('authorId'),
-                    'title': item.get('author'),
-                    'description': item.get('description'),
-                    'subscriber_count': item.get('subCount'),
-                    'thumbnails': item.get('authorThumbnails', []),
-                })
-            
-            elif item_type == 'playlist':
-                results['items'].append({
-                    'type': 'playlist',
-                    'playlist_id': item.get('playlistId'),
-                    'title': item.get('title'),
-                    'video_count': item.get('videoCount'),
-                    'author': item.get('author'),
-                    'channel_id': item.get('authorId'),
-                    'thumbnails': item.get('videos', [{}])[0].get('videoThumbnails', []) if item.get('videos') else [],
-                })
-        
-        return results
     
     def get_channel_info(self, channel_id):
         """
@@ -440,32 +442,167 @@ class InvidiousClient:
     def find_working_instance(cls, timeout=5):
         """
         Find a working Invidious instance
-        
+
+        All instances are probed concurrently and the first one whose
+        stats endpoint answers 200 wins - wall time is one round trip
+        instead of up to len(instances) * timeout when probing serially.
+
         Args:
             timeout: Timeout for each instance test
-            
+
         Returns:
             InvidiousClient or None: Working client or None
         """
-        import requests
-        
-        # Shuffle instances for load balancing
-        instances = cls.DEFAULT_INSTANCES.copy()
-        random.shuffle(instances)
-        
-        for instance_url in instances:
-            try:
-                # Quick test
-                response = requests.get(
-                    f'{instance_url}/api/v1/stats',
-                    timeout=timeout
-                )
-                if response.status_code == 200:
-                    if KODI_MODE:
-                        xbmc.log(f'[FreeTube] Found working Invidious instance: {instance_url}', xbmc.LOGINFO)
-                    return cls(instance_url=instance_url)
-            except Exception:
-                continue
-        
+        session = get_session()
+
+        # Shuffled copy in one pass, for load balancing
+        instances = random.sample(cls.DEFAULT_INSTANCES, len(cls.DEFAULT_INSTANCES))
+
+        with ThreadPoolExecutor(max_workers=len(instances)) as pool:
+            futures = {
+                pool.submit(session.get, f'{url}/api/v1/stats', timeout=timeout): url
+                for url in instances
+            }
+
+            for future in as_completed(futures):
+                try:
+                    if future.result().status_code != 200:
+                        continue
+                except Exception:
+                    continue
+
+                instance_url = futures[future]
+
+                # First healthy instance wins; drop the queued probes
+                for pending in futures:
+                    pending.cancel()
+
+                if KODI_MODE:
+                    xbmc.log(f'[FreeTube] Found working Invidious instance: {instance_url}', xbmc.LOGINFO)
+                return cls(instance_url=instance_url)
+
         return None
 
+
+
+def _iter_search_items(data):
+    """
+    Convert raw Invidious search entries one at a time
+
+    Args:
+        data: Decoded search response (list of raw entries)
+
+    Yields:
+        dict: Item in the standard shape
+    """
+    for item in data:
+        get = item.get
+        item_type = get('type')
+
+        if item_type == 'video':
+            yield {
+                'type': 'video',
+                'video_id': get('videoId'),
+                'title': get('title'),
+                'author': get('author'),
+                'channel_id': get('authorId'),
+                'duration': get('lengthSeconds'),
+                'view_count': get('viewCount'),
+                'published': get('publishedText'),
+                'thumbnails': get('videoThumbnails', []),
+                'live': get('liveNow', False),
+            }
+
+        elif item_type == 'channel':
+            yield {
+                'type': 'channel',
+                'channel_id': get('authorId'),
+                'title': get('author'),
+                'description': get('description'),
+                'subscriber_count': get('subCount'),
+                'thumbnails': get('authorThumbnails', []),
+            }
+
+        elif item_type == 'playlist':
+            videos = get('videos')
+            yield {
+                'type': 'playlist',
+                'playlist_id': get('playlistId'),
+                'title': get('title'),
+                'video_count': get('videoCount'),
+                'author': get('author'),
+                'channel_id': get('authorId'),
+                'thumbnails': videos[0].get('videoThumbnails', []) if videos else [],
+            }
+
+
+# Only a handful of (type, container) pairs ever occur, so intern the
+# built strings instead of allocating a new one per format entry
+_MIME_CACHE = {}
+
+
+def _mime_type(type_, container):
+    """
+    Build (or reuse) the 'type/container' mime string for a format
+
+    Args:
+        type_: Raw 'type' field from the format entry
+        container: Raw 'container' field from the format entry
+
+    Returns:
+        str: Combined mime string
+    """
+    key = (type_, container)
+    mime = _MIME_CACHE.get(key)
+    if mime is None:
+        mime = _MIME_CACHE[key] = f'{type_}/{container}'
+    return mime
+
+
+def _parse_size(size):
+    """
+    Split a 'WxH' size string in one pass
+
+    Args:
+        size: Size string like '1280x720' (may be empty)
+
+    Returns:
+        tuple: (width, height) ints, or (None, None)
+    """
+    width, sep, height = size.partition('x')
+    if sep and width.isdigit() and height.isdigit():
+        return int(width), int(height)
+    return None, None
+
+
+def _extract_format(fmt, proxy, adaptive=False):
+    """
+    Extract the fields callers actually use from one Invidious format entry
+
+    Reads each source key exactly once instead of re-materializing the
+    whole entry, which adds up over the ~30 adaptive formats per video.
+
+    Args:
+        fmt: Raw format dict from the Invidious response
+        proxy: Bound _get_proxied_url
+        adaptive: Include the audio-only fields
+
+    Returns:
+        VideoFormat: Format in the standard shape
+    """
+    get = fmt.get
+    width, height = _parse_size(get('size', ''))
+
+    return VideoFormat(
+        itag=get('itag'),
+        url=proxy(get('url')),
+        mime_type=_mime_type(get('type'), get('container')),
+        quality=get('quality'),
+        quality_label=get('qualityLabel'),
+        fps=get('fps'),
+        bitrate=get('bitrate'),
+        width=width,
+        height=height,
+        audio_quality=get('audioQuality') if adaptive else None,
+        audio_sample_rate=get('audioSampleRate') if adaptive else None,
+    )
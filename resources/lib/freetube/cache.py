@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+    Response Cache - Persistent On-Disk Caching
+
+    Small TTL cache for API responses stored in the addon profile
+    Repeated navigation (trending, channel pages, same search) returns
+    from disk instead of re-issuing identical network calls
+
+    Copyright (C) 2025 FreeTube Kodi Team
+
+    SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+
+from __future__ import absolute_import, division, unicode_literals
+
+import gzip
+import hashlib
+import json
+import os
+import time
+
+try:
+    import xbmcaddon
+    import xbmcvfs
+    KODI_MODE = True
+    from ._kodi import get_addon
+    addon = get_addon()
+    ADDON_DATA_PATH = xbmcvfs.translatePath(addon.getAddonInfo('profile'))
+except ImportError:
+    KODI_MODE = False
+    ADDON_DATA_PATH = os.path.expanduser('~/.kodi/userdata/addon_data/plugin.video.freetube')
+
+
+class ResponseCache:
+    """
+    Persistent TTL cache for JSON-serializable API responses
+    Entries are stored gzip-compressed so the cache stays small
+    """
+
+    def __init__(self, name='api', ttl=300):
+        """
+        Initialize cache
+
+        Args:
+            name: Cache namespace (separate directory per namespace)
+            ttl: Entry lifetime in seconds
+        """
+        self.cache_dir = os.path.join(ADDON_DATA_PATH, 'cache', name)
+        self.ttl = ttl
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, key):
+        """Map a cache key to its file path"""
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest + '.json.gz')
+
+    def get(self, key):
+        """
+        Get cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None when missing or expired
+        """
+        path = self._entry_path(key)
+
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with gzip.open(path, 'rb') as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def lookup(self, key):
+        """
+        Get cached value together with its freshness
+
+        Unlike get(), an expired entry is still returned so callers can
+        fall back to stale data when a refresh fails.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            tuple: (value, is_fresh); (None, False) when missing
+        """
+        path = self._entry_path(key)
+
+        try:
+            age = time.time() - os.path.getmtime(path)
+            with gzip.open(path, 'rb') as f:
+                return json.loads(f.read()), age <= self.ttl
+        except (OSError, ValueError):
+            return None, False
+
+    def set(self, key, value):
+        """
+        Store value in cache
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+        """
+        try:
+            with gzip.open(self._entry_path(key), 'wb') as f:
+                f.write(json.dumps(value).encode('utf-8'))
+        except (OSError, TypeError):
+            # Caching is best-effort; never fail the caller
+            pass
+
+    def prune(self):
+        """Remove expired entries"""
+        cutoff = time.time() - self.ttl
+
+        try:
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+        except OSError:
+            pass
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    """Get the shared response cache (lazily created)"""
+    global _response_cache
+
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+
+    return _response_cache
@@ -12,12 +12,24 @@
 
 from __future__ import absolute_import, division, unicode_literals
 
+import re
+import time
+
 try:
     import xbmc
     KODI_MODE = True
 except ImportError:
     KODI_MODE = False
 
+from ..api.http_client import get_session, json_loads, map_concurrently
+
+# Sentinel for memoized "no branding" responses
+_NEGATIVE = object()
+
+# YouTube video ids are exactly 11 URL-safe base64 chars; rejecting
+# malformed ids locally saves a guaranteed-404 round trip
+_VALID_VIDEO_ID = re.compile(r'^[A-Za-z0-9_-]{11}$').match
+
 
 class DeArrowClient:
     """
@@ -38,13 +50,33 @@ class DeArrowClient:
         """
         self.api_url = (api_url or self.DEFAULT_API_URL).rstrip('/')
         self.title_api_url = (title_api_url or self.DEFAULT_TITLE_API).rstrip('/')
-        
-        try:
-            import requests
-            self.session = requests.Session()
-        except ImportError:
-            raise ImportError('requests module is required')
-    
+
+        # Shared pooled session (reuses TCP/TLS connections across clients)
+        self.session = get_session()
+
+        # In-process memo: re-rendering the same list page must not
+        # re-issue one branding request per video
+        self._memo = {}
+
+    MEMO_TTL = 3600
+    NEGATIVE_TTL = 300
+
+    def _memo_get(self, key):
+        """Get a live entry from the in-process memo"""
+        entry = self._memo.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _memo_set(self, key, value, ttl):
+        """Store an entry in the in-process memo, evicting expired ones"""
+        now = time.monotonic()
+        if len(self._memo) >= 2048:
+            self._memo = {
+                k: entry for k, entry in self._memo.items() if entry[0] > now
+            }
+        self._memo[key] = (now + ttl, value)
+
     def get_branding(self, video_id):
         """
         Get DeArrow branding (title and thumbnail) for a video
@@ -55,19 +87,27 @@ class DeArrowClient:
         Returns:
             dict: Branding data with 'title' and 'thumbnail'
         """
+        if not video_id or not _VALID_VIDEO_ID(video_id):
+            return None
+
+        cached = self._memo_get(video_id)
+        if cached is not None:
+            return None if cached is _NEGATIVE else cached
+
         try:
             # Get title data
             url = f'{self.title_api_url}/api/branding'
             params = {'videoID': video_id}
-            
+
             response = self.session.get(url, params=params, timeout=5)
-            
+
             if response.status_code == 404:
-                # No branding found
+                # No branding found - remember briefly to avoid retry storms
+                self._memo_set(video_id, _NEGATIVE, self.NEGATIVE_TTL)
                 return None
             
             response.raise_for_status()
-            data = response.json()
+            data = json_loads(response.content)
             
             result = {}
             
@@ -92,13 +132,36 @@ class DeArrowClient:
                     # Use original thumbnail
                     result['thumbnail'] = None
             
-            return result if result else None
-        
+            if result:
+                self._memo_set(video_id, result, self.MEMO_TTL)
+                return result
+            self._memo_set(video_id, _NEGATIVE, self.NEGATIVE_TTL)
+            return None
+
         except Exception as e:
             if KODI_MODE:
                 xbmc.log(f'[FreeTube DeArrow] Error: {str(e)}', xbmc.LOGERROR)
             return None
     
+    def get_branding_batch(self, video_ids, max_workers=8):
+        """
+        Get branding for many videos concurrently
+
+        Fans the per-video requests out over the shared session so a
+        whole list page costs ~one round trip of wall time instead of
+        one per video. Memoized entries are answered without a request.
+
+        Args:
+            video_ids: Iterable of YouTube video IDs
+            max_workers: Upper bound on concurrent requests
+
+        Returns:
+            dict: Mapping of video_id to branding dict (or None)
+        """
+        video_ids = list(video_ids)
+        brandings = map_concurrently(self.get_branding, video_ids, max_workers)
+        return dict(zip(video_ids, brandings))
+
     def get_thumbnail_url(self, video_id, timestamp=None):
         """
         Get DeArrow thumbnail URL
@@ -12,7 +12,19 @@
 
 from __future__ import absolute_import, division, unicode_literals
 
+import array
 import hashlib
+import json
+import re
+import secrets
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    from urllib.parse import quote
+except ImportError:
+    from urllib import quote
 
 try:
     import xbmc
@@ -20,6 +32,12 @@ try:
 except ImportError:
     KODI_MODE = False
 
+from ..api.http_client import get_session, json_loads
+
+# YouTube video ids are exactly 11 URL-safe base64 chars; rejecting
+# malformed ids locally saves a guaranteed-404 round trip
+_VALID_VIDEO_ID = re.compile(r'^[A-Za-z0-9_-]{11}$').match
+
 
 class SponsorBlockClient:
     """
@@ -40,7 +58,15 @@ class SponsorBlockClient:
         'music_offtopic': 'Non-Music Section',
         'filler': 'Filler Tangent',
     }
-    
+
+    # Precomputed JSON for the default category filter - the common case
+    # never needs to rebuild this per call
+    _DEFAULT_CATEGORIES_JSON = '["sponsor","intro","outro","selfpromo","interaction","preview"]'
+
+    # Same filter, URL-encoded once, so the default-path request skips
+    # requests' per-call params encoding entirely
+    _DEFAULT_CATEGORIES_QS = quote(_DEFAULT_CATEGORIES_JSON, safe='')
+
     def __init__(self, api_url=None):
         """
         Initialize SponsorBlock client
@@ -49,13 +75,33 @@ class SponsorBlockClient:
             api_url: SponsorBlock API URL (optional)
         """
         self.api_url = (api_url or self.DEFAULT_API_URL).rstrip('/')
-        
-        try:
-            import requests
-            self.session = requests.Session()
-        except ImportError:
-            raise ImportError('requests module is required')
-    
+
+        # Shared pooled session (reuses TCP/TLS connections across clients)
+        self.session = get_session()
+
+        # In-process memo: re-rendering the same list page must not
+        # re-issue one segments request per video
+        self._memo = {}
+
+    MEMO_TTL = 3600
+    NEGATIVE_TTL = 300
+
+    def _memo_get(self, key):
+        """Get a live entry from the in-process memo"""
+        entry = self._memo.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _memo_set(self, key, value, ttl):
+        """Store an entry in the in-process memo, evicting expired ones"""
+        now = time.monotonic()
+        if len(self._memo) >= 2048:
+            self._memo = {
+                k: entry for k, entry in self._memo.items() if entry[0] > now
+            }
+        self._memo[key] = (now + ttl, value)
+
     def get_segments(self, video_id, categories=None):
         """
         Get skip segments for a video
@@ -67,60 +113,198 @@ class SponsorBlockClient:
         Returns:
             list: List of segments
         """
+        if not video_id or not _VALID_VIDEO_ID(video_id):
+            return []
+
+        memo_key = (video_id, tuple(categories) if categories else None)
+        cached = self._memo_get(memo_key)
+        if cached is not None:
+            return cached
+
         try:
-            # Build category filter
+            # Make API request - default filter ships pre-encoded
             if categories:
-                category_param = '["' + '","'.join(categories) + '"]'
+                category_param = json.dumps(list(categories), separators=(',', ':'))
+                response = self.session.get(
+                    f'{self.api_url}/api/skipSegments',
+                    params={'videoID': video_id, 'categories': category_param},
+                    timeout=5
+                )
             else:
-                category_param = '["sponsor","intro","outro","selfpromo","interaction","preview"]'
-            
-            # Make API request
-            url = f'{self.api_url}/api/skipSegments'
-            params = {
-                'videoID': video_id,
-                'categories': category_param,
-            }
-            
-            response = self.session.get(url, params=params, timeout=5)
+                url = (
+                    f'{self.api_url}/api/skipSegments'
+                    f'?videoID={quote(video_id)}&categories={self._DEFAULT_CATEGORIES_QS}'
+                )
+                response = self.session.get(url, timeout=5)
             
             if response.status_code == 404:
-                # No segments found
+                # No segments found - remember briefly to avoid retry storms
+                self._memo_set(memo_key, [], self.NEGATIVE_TTL)
                 return []
             
             response.raise_for_status()
-            data = response.json()
-            
-            # Parse segments
-            segments = []
-            for item in data:
-                segment = item.get('segment', [])
-                if len(segment) == 2:
-                    segments.append({
-                        'start': segment[0],
-                        'end': segment[1],
-                        'category': item.get('category'),
-                        'action_type': item.get('actionType', 'skip'),
-                        'uuid': item.get('UUID'),
-                    })
-            
+            segments = self._parse_segments(json_loads(response.content))
+
+            self._memo_set(memo_key, segments, self.MEMO_TTL)
             return segments
-        
+
         except Exception as e:
             if KODI_MODE:
                 xbmc.log(f'[FreeTube SponsorBlock] Error: {str(e)}', xbmc.LOGERROR)
             return []
     
-    def should_skip_segment(self, current_time, segments):
+    @staticmethod
+    def _parse_segments(data):
+        """
+        Parse raw segment entries into the standard shape
+
+        Args:
+            data: List of raw segment dicts from the API
+
+        Returns:
+            list: List of segments
+        """
+        segments = []
+        for item in data:
+            segment = item.get('segment', [])
+            if len(segment) == 2:
+                segments.append({
+                    'start': segment[0],
+                    'end': segment[1],
+                    'category': item.get('category'),
+                    'action_type': item.get('actionType', 'skip'),
+                    'uuid': item.get('UUID'),
+                })
+        return segments
+
+    def get_segments_batch(self, video_ids, categories=None):
+        """
+        Get skip segments for many videos via the hash-prefix endpoint
+
+        SHA-256 hashes each video id and requests /api/skipSegments/<4
+        hex chars>, which returns segments for every video sharing the
+        prefix - one round trip covers the whole prefix group and the
+        server never sees the exact ids. Prefix groups are fetched in
+        parallel on the shared session.
+
+        Args:
+            video_ids: Iterable of YouTube video IDs
+            categories: List of categories to fetch (None = all)
+
+        Returns:
+            dict: Mapping of video_id to list of segments
+        """
+        if categories:
+            category_param = json.dumps(list(categories), separators=(',', ':'))
+            memo_suffix = tuple(categories)
+        else:
+            category_param = self._DEFAULT_CATEGORIES_JSON
+            memo_suffix = None
+
+        results = {}
+        prefixes = {}
+        for video_id in video_ids:
+            if not video_id or not _VALID_VIDEO_ID(video_id):
+                results[video_id] = []
+                continue
+            cached = self._memo_get((video_id, memo_suffix))
+            if cached is not None:
+                results[video_id] = cached
+                continue
+            results[video_id] = []
+            prefix = hashlib.sha256(video_id.encode()).hexdigest()[:4]
+            prefixes.setdefault(prefix, []).append(video_id)
+
+        if not prefixes:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(8, len(prefixes))) as pool:
+            futures = {
+                pool.submit(self._fetch_prefix, prefix, category_param): prefix
+                for prefix in prefixes
+            }
+
+            for future in as_completed(futures):
+                prefix = futures[future]
+                wanted = prefixes[prefix]
+                entries = future.result()
+                for entry in entries:
+                    video_id = entry.get('videoID')
+                    if video_id in wanted:
+                        results[video_id] = self._parse_segments(entry.get('segments', []))
+                for video_id in wanted:
+                    ttl = self.MEMO_TTL if results[video_id] else self.NEGATIVE_TTL
+                    self._memo_set((video_id, memo_suffix), results[video_id], ttl)
+
+        return results
+
+    def _fetch_prefix(self, prefix, category_param):
+        """
+        Fetch all segment entries for one hash prefix
+
+        Args:
+            prefix: First 4 hex chars of the video id SHA-256
+            category_param: Encoded categories JSON array
+
+        Returns:
+            list: Per-video entries (empty on 404 or error)
+        """
+        try:
+            url = f'{self.api_url}/api/skipSegments/{prefix}'
+            response = self.session.get(
+                url, params={'categories': category_param}, timeout=5
+            )
+
+            if response.status_code == 404:
+                return []
+
+            response.raise_for_status()
+            return json_loads(response.content)
+
+        except Exception as e:
+            if KODI_MODE:
+                xbmc.log(f'[FreeTube SponsorBlock] Batch error: {str(e)}', xbmc.LOGERROR)
+            return []
+
+    @staticmethod
+    def prepare_segments(segments):
+        """
+        Sort segments for fast playback-time lookup
+
+        Args:
+            segments: List of segments from get_segments
+
+        Returns:
+            tuple: (sorted segments, array of their start times)
+        """
+        ordered = sorted(segments, key=lambda s: s['start'])
+        starts = array.array('d', (s['start'] for s in ordered))
+        return ordered, starts
+
+    def should_skip_segment(self, current_time, segments, starts=None):
         """
         Check if current time is in a skip segment
-        
+
+        Called on every playback tick, so the prepared form jumps to the
+        candidate segment with a binary search instead of scanning the
+        whole list. Plain unsorted lists still work without `starts`.
+
         Args:
             current_time: Current playback time in seconds
-            segments: List of segments
-            
+            segments: List of segments (sorted when `starts` is given)
+            starts: Start-time array from prepare_segments (optional)
+
         Returns:
             dict or None: Segment to skip or None
         """
+        if starts is not None:
+            idx = bisect_right(starts, current_time) - 1
+            if idx >= 0:
+                segment = segments[idx]
+                if current_time < segment['end']:
+                    return segment
+            return None
+
         for segment in segments:
             if segment['start'] <= current_time < segment['end']:
                 return segment
@@ -167,16 +351,11 @@ class SponsorBlockClient:
     def generate_user_id():
         """
         Generate random user ID for SponsorBlock submissions
-        
+
         Returns:
             str: User ID
         """
-        import uuid
-        import hashlib
-        
-        # Generate UUID and hash it
-        user_uuid = str(uuid.uuid4())
-        user_id = hashlib.sha256(user_uuid.encode()).hexdigest()
-        
-        return user_id
+        # Same 256-bit random hex token, straight from the OS CSPRNG
+        # without the uuid + sha256 detour
+        return secrets.token_hex(32)
 
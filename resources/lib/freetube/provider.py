@@ -13,22 +13,80 @@
 from __future__ import absolute_import, division, unicode_literals
 
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
 
 try:
-    from urllib.parse import urlencode, parse_qs
+    from urllib.parse import urlencode, parse_qs, quote
 except ImportError:
-    from urllib import urlencode
+    from urllib import urlencode, quote
     from urlparse import parse_qs
 
 import xbmc
 import xbmcgui
 import xbmcplugin
-import xbmcaddon
 
+from ._kodi import get_addon
 from .api import InnertubeClient, InvidiousClient
+from .cache import ResponseCache
 from .storage import Database, SubscriptionsManager, HistoryManager, ProfilesManager, PlaylistsManager
 
 
+@lru_cache(maxsize=512)
+def _encode_params(items):
+    """
+    Encode a sorted parameter tuple as a query string
+
+    Context-menu and navigation URLs repeat the same few parameter
+    combinations across every rendered item; the memo skips the
+    urlencode work for all but the first occurrence.
+    """
+    return urlencode(items)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Immutable snapshot of the addon settings read during a plugin call
+
+    Each getSetting() is a trip into Kodi's C++ side; reading them once
+    per invocation keeps the per-item render and playback paths free of
+    repeated boundary crossings.
+    """
+    api_backend: str
+    enable_fallback: bool
+    language: str
+    region: str
+    innertube_client: str
+    invidious_instance: str
+    enable_watch_history: bool
+    enable_prefetch: bool
+    quality_cap: int
+
+    # video_quality select indices map to a height cap; 0 means
+    # "Best Available" (no cap)
+    _QUALITY_CAPS = {'1': 1080, '2': 720, '3': 480, '4': 360}
+
+    @classmethod
+    def from_addon(cls, addon):
+        """Read the snapshot from an xbmcaddon.Addon instance"""
+        get = addon.getSetting
+        return cls(
+            api_backend=get('api_backend') or 'local',
+            enable_fallback=get('enable_api_fallback') == 'true',
+            language=get('content_language') or 'en',
+            region=get('content_region') or 'US',
+            innertube_client=get('innertube_client') or 'web',
+            invidious_instance=get('invidious_instance'),
+            enable_watch_history=get('enable_watch_history') == 'true',
+            enable_prefetch=get('enable_prefetch') != 'false',
+            quality_cap=cls._QUALITY_CAPS.get(get('video_quality'), 0),
+        )
+
+
 class FreeTubeProvider:
     """Main provider for FreeTube Kodi plugin"""
     
@@ -42,62 +100,113 @@ class FreeTubeProvider:
         """
         self.handle = addon_handle
         self.url = addon_url
-        self.addon = xbmcaddon.Addon()
+        self._url_prefix = addon_url + '?'
+        self.addon = get_addon()
         self.addon_id = self.addon.getAddonInfo('id')
-        
-        # Initialize database and managers
-        self.db = Database()
-        self.subscriptions = SubscriptionsManager(self.db)
-        self.history = HistoryManager(self.db)
-        self.profiles = ProfilesManager(self.db)
-        self.playlists = PlaylistsManager(self.db)
-        
-        # Get current profile
-        self.current_profile = self.profiles.get_default_profile()
-        if not self.current_profile:
+        # Read once: every directory item without explicit fanart would
+        # otherwise pay a getAddonInfo() C++ trip
+        self._default_fanart = self.addon.getAddonInfo('fanart')
+
+        # Directory items are buffered and handed to Kodi in a single
+        # addDirectoryItems call - one C++ boundary crossing per
+        # listing instead of one per item
+        self._pending_items = []
+
+    # Everything below is built on first access: most routes only
+    # touch a subset (play needs just the API client and history,
+    # unsubscribe needs just the database), so eager construction in
+    # __init__ taxed every invocation for subsystems it never used
+
+    @cached_property
+    def db(self):
+        """Database, opened on first storage access"""
+        return Database()
+
+    @cached_property
+    def subscriptions(self):
+        return SubscriptionsManager(self.db)
+
+    @cached_property
+    def history(self):
+        return HistoryManager(self.db)
+
+    @cached_property
+    def profiles(self):
+        return ProfilesManager(self.db)
+
+    @cached_property
+    def playlists(self):
+        return PlaylistsManager(self.db)
+
+    @cached_property
+    def current_profile(self):
+        """Current profile (the default one, created if missing)"""
+        profile = self.profiles.get_default_profile()
+        if not profile:
             # Create default profile if none exists
             profile_id = self.profiles.create_profile('Default Profile', is_default=True)
-            self.current_profile = self.profiles.get_profile(profile_id)
-        
-        # Initialize API clients
-        self._init_api_clients()
-    
-    def _init_api_clients(self):
-        """Initialize API clients based on settings"""
-        # Get API backend preference
-        api_backend = self.addon.getSetting('api_backend') or 'local'
-        enable_fallback = self.addon.getSetting('enable_api_fallback') == 'true'
-        
-        # Language and region
-        language = self.addon.getSetting('content_language') or 'en'
-        region = self.addon.getSetting('content_region') or 'US'
-        
+            profile = self.profiles.get_profile(profile_id)
+        return profile
+
+    @cached_property
+    def subscribed_ids(self):
+        """
+        Subscribed channel ids for the current profile
+
+        One query per invocation; add_video_item checks membership here
+        instead of running an is_subscribed query per rendered video
+        """
+        return self.subscriptions.get_subscribed_ids(self.current_profile['profile_id'])
+
+    @cached_property
+    def cache(self):
+        """
+        Persistent cache for rendered listings: repeat opens of the
+        feed/trending/search render from disk, and stale entries act
+        as an offline fallback when the API errors
+        """
+        return ResponseCache(name='provider', ttl=600)
+
+    @cached_property
+    def settings(self):
+        """Snapshot of the addon settings, read once per invocation"""
+        return Settings.from_addon(self.addon)
+
+    @cached_property
+    def api_client(self):
+        """Primary API client, chosen by the configured backend"""
+        settings = self.settings
+
         try:
-            if api_backend == 'invidious':
+            if settings.api_backend == 'invidious':
                 # Use Invidious as primary
-                instance_url = self.addon.getSetting('invidious_instance')
-                if instance_url:
-                    self.api_client = InvidiousClient(instance_url=instance_url)
-                else:
-                    self.api_client = InvidiousClient(random_instance=True)
-                
-                # Innertube as fallback
-                if enable_fallback:
-                    self.fallback_client = InnertubeClient('web', language, region)
-            else:
-                # Use Local Innertube as primary
-                client_type = self.addon.getSetting('innertube_client') or 'web'
-                self.api_client = InnertubeClient(client_type, language, region)
-                
-                # Invidious as fallback
-                if enable_fallback:
-                    self.fallback_client = InvidiousClient(random_instance=True)
-        
+                if settings.invidious_instance:
+                    return InvidiousClient(instance_url=settings.invidious_instance)
+                return InvidiousClient(random_instance=True)
+
+            # Use Local Innertube as primary
+            return InnertubeClient(settings.innertube_client, settings.language, settings.region)
+
         except Exception as e:
             xbmc.log(f'[FreeTube] API client init error: {str(e)}', xbmc.LOGERROR)
             # Fallback to basic Innertube client
-            self.api_client = InnertubeClient('web', language, region)
-            self.fallback_client = None
+            return InnertubeClient('web', settings.language, settings.region)
+
+    @cached_property
+    def fallback_client(self):
+        """Secondary client for the other backend, or None if disabled"""
+        settings = self.settings
+        if not settings.enable_fallback:
+            return None
+
+        try:
+            if settings.api_backend == 'invidious':
+                return InnertubeClient('web', settings.language, settings.region)
+            return InvidiousClient(random_instance=True)
+
+        except Exception as e:
+            xbmc.log(f'[FreeTube] Fallback client init error: {str(e)}', xbmc.LOGERROR)
+            return None
     
     def build_url(self, params):
         """
@@ -109,7 +218,7 @@ class FreeTubeProvider:
         Returns:
             str: Plugin URL
         """
-        return f'{self.url}?{urlencode(params)}'
+        return self._url_prefix + _encode_params(tuple(sorted(params.items())))
     
     def add_directory_item(self, title, url_params, icon='DefaultFolder.png', fanart=None,
                           context_menu=None, is_folder=True, info_labels=None):
@@ -136,21 +245,34 @@ class FreeTubeProvider:
         list_item.setArt({
             'icon': icon,
             'thumb': icon,
-            'fanart': fanart or self.addon.getAddonInfo('fanart')
+            'fanart': fanart or self._default_fanart
         })
         
         # Set context menu
         if context_menu:
             list_item.addContextMenuItems(context_menu)
-        
-        xbmcplugin.addDirectoryItem(self.handle, url, list_item, is_folder)
+
+        self._pending_items.append((url, list_item, is_folder))
     
-    def add_video_item(self, video):
+    # Static context-menu entry, shared across all video items
+    _QUEUE_ENTRY = ('Queue', 'Action(Queue)')
+
+    # Context-menu URL templates: the RunPlugin wrapper and parameter
+    # names are constant, so .format() with a quoted id replaces a
+    # dict build + sort + urlencode per entry per item
+    _CM_ADD_PLAYLIST = 'RunPlugin({base}action=add_to_playlist&video_id={vid})'
+    _CM_SUBSCRIBE = 'RunPlugin({base}action=subscribe&channel_id={cid}&channel_name={name})'
+    _CM_UNSUBSCRIBE = 'RunPlugin({base}action=unsubscribe&channel_id={cid})'
+
+    def add_video_item(self, video, show_subscribe=True):
         """
         Add video item to Kodi
-        
+
         Args:
             video: Video data dict
+            show_subscribe: Include the Subscribe/Unsubscribe entry;
+                            feed views pass False since every video is
+                            from a subscribed channel already
         """
         title = video.get('title', 'Unknown')
         video_id = video.get('video_id')
@@ -161,57 +283,102 @@ class FreeTubeProvider:
         # Create list item
         list_item = xbmcgui.ListItem(label=title)
         list_item.setProperty('IsPlayable', 'true')
-        
-        # Set video info
-        info_labels = {
-            'title': title,
-            'plot': video.get('short_description', ''),
-            'duration': video.get('length_seconds', 0),
-            'aired': video.get('published', ''),
-        }
-        
-        if video.get('author'):
+
+        # Set video info - empty fields are skipped; every value here
+        # is copied into a C++ string on the Kodi side
+        info_labels = {'title': title}
+
+        get = video.get
+        if get('short_description'):
+            info_labels['plot'] = video['short_description']
+        if get('length_seconds'):
+            info_labels['duration'] = video['length_seconds']
+        if get('published'):
+            info_labels['aired'] = video['published']
+        if get('author'):
             info_labels['studio'] = video['author']
-        
-        if video.get('view_count'):
+        if get('view_count'):
             info_labels['playcount'] = video['view_count']
-        
+
         list_item.setInfo('video', info_labels)
-        
-        # Set thumbnail
-        thumbnails = video.get('thumbnails', [])
+
+        # Set thumbnail ('thumb' is what list views render; mirroring
+        # it into 'icon' just doubled the art dict)
+        thumbnails = get('thumbnails', [])
         if thumbnails:
             thumb = thumbnails[-1].get('url') if isinstance(thumbnails[-1], dict) else thumbnails[-1]
-            list_item.setArt({'thumb': thumb, 'icon': thumb})
+            list_item.setArt({'thumb': thumb})
         
         # Context menu
         context_menu = [
-            ('Queue', f'Action(Queue)'),
-            ('Add to Playlist', f'RunPlugin({self.build_url({"action": "add_to_playlist", "video_id": video_id})})'),
+            self._QUEUE_ENTRY,
+            ('Add to Playlist',
+             self._CM_ADD_PLAYLIST.format(base=self._url_prefix, vid=quote(video_id or ''))),
         ]
-        
+
         # Subscribe/Unsubscribe option
-        if video.get('channel_id'):
-            if self.subscriptions.is_subscribed(self.current_profile['profile_id'], video['channel_id']):
+        if show_subscribe and video.get('channel_id'):
+            channel_id = video['channel_id']
+            if channel_id in self.subscribed_ids:
                 context_menu.append((
                     'Unsubscribe',
-                    f'RunPlugin({self.build_url({"action": "unsubscribe", "channel_id": video["channel_id"]})})'
+                    self._CM_UNSUBSCRIBE.format(base=self._url_prefix, cid=quote(channel_id))
                 ))
             else:
                 context_menu.append((
                     'Subscribe',
-                    f'RunPlugin({self.build_url({"action": "subscribe", "channel_id": video["channel_id"], "channel_name": video.get("author", "")})})'
+                    self._CM_SUBSCRIBE.format(
+                        base=self._url_prefix,
+                        cid=quote(channel_id),
+                        name=quote(video.get('author', ''))
+                    )
                 ))
         
         list_item.addContextMenuItems(context_menu)
-        
-        xbmcplugin.addDirectoryItem(self.handle, url, list_item, False)
-    
+
+        self._pending_items.append((url, list_item, False))
+
+    def _flush_items(self):
+        """Hand all buffered items to Kodi in one call"""
+        if self._pending_items:
+            xbmcplugin.addDirectoryItems(self.handle, self._pending_items, len(self._pending_items))
+            self._pending_items = []
+
+    @contextmanager
+    def _directory(self, category, content='videos'):
+        """
+        Context manager wrapping a directory listing
+
+        Sets the category and content type on entry; flushes buffered
+        items and closes the directory on exit, including early returns,
+        so every show_* method gets the batched addDirectoryItems path
+        without repeating the boilerplate.
+
+        Args:
+            category: Plugin category label
+            content: Kodi content type
+        """
+        xbmcplugin.setPluginCategory(self.handle, category)
+        xbmcplugin.setContent(self.handle, content)
+        try:
+            yield
+        finally:
+            self._flush_items()
+            xbmcplugin.endOfDirectory(self.handle)
+
     def show_main_menu(self):
         """Show main menu"""
-        xbmcplugin.setPluginCategory(self.handle, 'FreeTube')
-        xbmcplugin.setContent(self.handle, 'videos')
-        
+        with self._directory('FreeTube'):
+            self._render_main_menu()
+
+        # The next click is almost always Subscriptions or Trending;
+        # start filling their cache while the user reads the menu
+        if self.settings.enable_prefetch:
+            threading.Thread(target=self._prefetch_warm, daemon=True).start()
+
+    def _render_main_menu(self):
+        """Queue the main menu entries"""
+
         # Subscriptions
         self.add_directory_item(
             'Subscriptions',
@@ -261,108 +428,183 @@ class FreeTubeProvider:
             {'action': 'settings'},
             icon='DefaultAddonService.png'
         )
-        
-        xbmcplugin.endOfDirectory(self.handle)
-    
+
+    def _prefetch_warm(self):
+        """
+        Prefetch trending and the first feed channels into the cache
+
+        Runs on a background thread after the main menu renders; every
+        entry written is one request the next screen doesn't have to
+        make. Best-effort - an early process exit just means a partial
+        warm-up.
+        """
+        try:
+            cached, is_fresh = self.cache.lookup('trending')
+            if not is_fresh:
+                result = self.api_client.get_trending()
+                self.cache.set('trending', result.get('items', []))
+
+            profile_id = self.current_profile['profile_id']
+            for channel_id, _ in self.subscriptions.get_subscriptions_brief(profile_id)[:5]:
+                key = f'feed|{channel_id}'
+                cached, is_fresh = self.cache.lookup(key)
+                if is_fresh:
+                    continue
+                result = self.api_client.get_channel_videos(channel_id)
+                self.cache.set(key, result.get('items', [])[:5])
+
+        except Exception as e:
+            xbmc.log(f'[FreeTube] Prefetch error: {str(e)}', xbmc.LOGDEBUG)
+
     def show_subscriptions(self):
         """Show subscriptions feed"""
-        xbmcplugin.setPluginCategory(self.handle, 'Subscriptions')
-        xbmcplugin.setContent(self.handle, 'videos')
-        
-        # Get subscriptions
-        profile_id = self.current_profile['profile_id']
-        subs = self.subscriptions.get_subscriptions(profile_id)
-        
-        if not subs:
-            xbmcgui.Dialog().notification(
-                'FreeTube',
-                'No subscriptions yet. Subscribe to channels!',
-                xbmcgui.NOTIFICATION_INFO
-            )
-            xbmcplugin.endOfDirectory(self.handle)
-            return
-        
-        # Add "All Subscriptions" view
-        self.add_directory_item(
-            'All Subscriptions Feed',
-            {'action': 'subscriptions_feed'},
-            icon='DefaultTVShows.png'
-        )
-        
-        # Show channels
-        for sub in subs:
-            context_menu = [
-                ('Unsubscribe', f'RunPlugin({self.build_url({"action": "unsubscribe", "channel_id": sub["channel_id"]})})')
-            ]
-            
+        with self._directory('Subscriptions'):
+            # Get subscriptions
+            profile_id = self.current_profile['profile_id']
+            subs = self.subscriptions.get_subscriptions(profile_id)
+
+            if not subs:
+                xbmcgui.Dialog().notification(
+                    'FreeTube',
+                    'No subscriptions yet. Subscribe to channels!',
+                    xbmcgui.NOTIFICATION_INFO
+                )
+                return
+
+            # Add "All Subscriptions" view
             self.add_directory_item(
-                sub['channel_name'],
-                {'action': 'channel', 'channel_id': sub['channel_id']},
-                icon=sub.get('channel_thumbnail', 'DefaultActor.png'),
-                context_menu=context_menu
+                'All Subscriptions Feed',
+                {'action': 'subscriptions_feed'},
+                icon='DefaultTVShows.png'
             )
-        
-        xbmcplugin.endOfDirectory(self.handle)
-    
+
+            # Show channels
+            for sub in subs:
+                context_menu = [
+                    ('Unsubscribe',
+                     self._CM_UNSUBSCRIBE.format(base=self._url_prefix, cid=quote(sub['channel_id'])))
+                ]
+
+                self.add_directory_item(
+                    sub['channel_name'],
+                    {'action': 'channel', 'channel_id': sub['channel_id']},
+                    icon=sub['channel_thumbnail'] or 'DefaultActor.png',
+                    context_menu=context_menu
+                )
+
     def show_subscriptions_feed(self):
         """Show videos from all subscribed channels"""
-        xbmcplugin.setPluginCategory(self.handle, 'Subscriptions Feed')
-        xbmcplugin.setContent(self.handle, 'videos')
-        
+        with self._directory('Subscriptions Feed'):
+            self._render_subscriptions_feed()
+
+    def _render_subscriptions_feed(self):
+        """Queue the aggregated feed items for subscribed channels"""
         profile_id = self.current_profile['profile_id']
-        subs = self.subscriptions.get_subscriptions(profile_id)
-        
+        # The feed only needs id + name per channel; skip full-row dicts
+        subs = self.subscriptions.get_subscriptions_brief(profile_id)
+
         if not subs:
-            xbmcplugin.endOfDirectory(self.handle)
             return
-        
+
         # Get videos from each channel (limit to prevent slowdown)
-        all_videos = []
         max_channels = 20  # Limit to prevent long load times
-        
-        progress = xbmcgui.DialogProgress()
-        progress.create('FreeTube', 'Loading subscription feed...')
-        
-        for idx, sub in enumerate(subs[:max_channels]):
-            if progress.iscanceled():
-                break
-            
-            progress.update(int((idx / len(subs[:max_channels])) * 100), f'Loading {sub["channel_name"]}...')
-            
-            try:
-                result = self.api_client.get_channel_videos(sub['channel_id'])
-                videos = result.get('items', [])[:5]  # Latest 5 videos per channel
-                all_videos.extend(videos)
-            except Exception:
-                continue
-        
-        progress.close()
-        
-        # Sort by published date (if available)
-        # For now, just show all videos
-        for video in all_videos[:50]:  # Limit to 50 videos
-            self.add_video_item(video)
-        
-        xbmcplugin.endOfDirectory(self.handle)
-    
+        channels = subs[:max_channels]
+        render_limit = 50  # Stop queueing once a screenful is ready
+        rendered = 0
+
+        # Channels with a fresh cache entry render without a request;
+        # expired entries are kept as fallback if the refresh fails
+        to_fetch = []
+        stale = {}
+        for channel_id, channel_name in channels:
+            cached, is_fresh = self.cache.lookup(f'feed|{channel_id}')
+            if is_fresh:
+                for video in cached[:render_limit - rendered]:
+                    self.add_video_item(video, show_subscribe=False)
+                rendered += min(len(cached), render_limit - rendered)
+            else:
+                to_fetch.append((channel_id, channel_name))
+                if cached is not None:
+                    stale[channel_id] = cached
+
+        if to_fetch and rendered < render_limit:
+            progress = xbmcgui.DialogProgress()
+            progress.create('FreeTube', 'Loading subscription feed...')
+
+            # Fetch channels in parallel - the work is network-bound, so
+            # wall time is ~ceil(N / workers) round trips instead of N.
+            # Each channel's videos are queued as its response arrives
+            # instead of buffering the whole feed first.
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = {
+                    executor.submit(self.api_client.get_channel_videos, channel_id): (channel_id, channel_name)
+                    for channel_id, channel_name in to_fetch
+                }
+
+                done = 0
+                fetched_ids = []
+                try:
+                    for future in as_completed(futures):
+                        if progress.iscanceled() or rendered >= render_limit:
+                            # Drop the queued fetches by hand
+                            # (cancel_futures= needs 3.9; the addon
+                            # floor is 3.8) so the with-exit join only
+                            # waits out the handful already in flight
+                            for pending in futures:
+                                pending.cancel()
+                            break
+
+                        done += 1
+                        channel_id, channel_name = futures[future]
+                        progress.update(int((done / len(to_fetch)) * 100), f'Loaded {channel_name}')
+
+                        try:
+                            result = future.result()
+                            videos = result.get('items', [])[:5]  # Latest 5 videos per channel
+                            self.cache.set(f'feed|{channel_id}', videos)
+                            fetched_ids.append(channel_id)
+                        except Exception:
+                            # Stale beats empty when the refresh fails
+                            videos = stale.get(channel_id, [])
+
+                        for video in videos[:render_limit - rendered]:
+                            self.add_video_item(video, show_subscribe=False)
+                        rendered += min(len(videos), render_limit - rendered)
+                finally:
+                    # Close before the executor exit joins the workers,
+                    # not after - a cancel would otherwise leave the
+                    # dialog on screen while in-flight fetches finish
+                    progress.close()
+
+            # One batched UPDATE via the (profile_id, last_fetched) index
+            if fetched_ids:
+                self.subscriptions.update_last_fetched(profile_id, fetched_ids)
+
     def show_trending(self):
         """Show trending videos"""
-        xbmcplugin.setPluginCategory(self.handle, 'Trending')
-        xbmcplugin.setContent(self.handle, 'videos')
-        
-        try:
-            result = self.api_client.get_trending()
-            videos = result.get('items', [])
-            
+        with self._directory('Trending'):
+            cached, is_fresh = self.cache.lookup('trending')
+
+            if is_fresh:
+                videos = cached
+            else:
+                try:
+                    result = self.api_client.get_trending()
+                    videos = result.get('items', [])
+                    self.cache.set('trending', videos)
+
+                except Exception as e:
+                    xbmc.log(f'[FreeTube] Trending error: {str(e)}', xbmc.LOGERROR)
+                    if cached is not None:
+                        # Stale results still beat an empty error screen
+                        videos = cached
+                    else:
+                        xbmcgui.Dialog().notification('FreeTube', 'Error loading trending', xbmcgui.NOTIFICATION_ERROR)
+                        videos = []
+
             for video in videos:
                 self.add_video_item(video)
-        
-        except Exception as e:
-            xbmc.log(f'[FreeTube] Trending error: {str(e)}', xbmc.LOGERROR)
-            xbmcgui.Dialog().notification('FreeTube', 'Error loading trending', xbmcgui.NOTIFICATION_ERROR)
-        
-        xbmcplugin.endOfDirectory(self.handle)
-    
+
     def search_videos(self, query=None):
         """Search for videos"""
         if not query:
@@ -372,14 +614,26 @@ class FreeTubeProvider:
                 xbmcplugin.endOfDirectory(self.handle)
                 return
             query = keyboard
-        
-        xbmcplugin.setPluginCategory(self.handle, f'Search: {query}')
-        xbmcplugin.setContent(self.handle, 'videos')
-        
-        try:
-            result = self.api_client.search(query)
-            items = result.get('items', [])
-            
+
+        with self._directory(f'Search: {query}'):
+            cached, is_fresh = self.cache.lookup(f'search|{query}')
+
+            if is_fresh:
+                items = cached
+            else:
+                try:
+                    result = self.api_client.search(query)
+                    items = result.get('items', [])
+                    self.cache.set(f'search|{query}', items)
+
+                except Exception as e:
+                    xbmc.log(f'[FreeTube] Search error: {str(e)}', xbmc.LOGERROR)
+                    if cached is not None:
+                        items = cached
+                    else:
+                        xbmcgui.Dialog().notification('FreeTube', 'Search error', xbmcgui.NOTIFICATION_ERROR)
+                        items = []
+
             for item in items:
                 if item.get('type') == 'video':
                     self.add_video_item(item)
@@ -389,13 +643,7 @@ class FreeTubeProvider:
                         {'action': 'channel', 'channel_id': item['channel_id']},
                         icon=item.get('thumbnails', [{}])[0].get('url') if item.get('thumbnails') else 'DefaultActor.png'
                     )
-        
-        except Exception as e:
-            xbmc.log(f'[FreeTube] Search error: {str(e)}', xbmc.LOGERROR)
-            xbmcgui.Dialog().notification('FreeTube', 'Search error', xbmcgui.NOTIFICATION_ERROR)
-        
-        xbmcplugin.endOfDirectory(self.handle)
-    
+
     def play_video(self, video_id):
         """
         Play video
@@ -403,6 +651,9 @@ class FreeTubeProvider:
         Args:
             video_id: YouTube video ID
         """
+        if not video_id:
+            return
+
         try:
             # Get video info
             video_info = self.api_client.get_video_info(video_id)
@@ -414,12 +665,25 @@ class FreeTubeProvider:
                 xbmcgui.Dialog().notification('FreeTube', 'No playable streams found', xbmcgui.NOTIFICATION_ERROR)
                 return
             
-            # Sort by quality (height) and select best
-            video_formats = [f for f in formats if f.get('height')]
-            if video_formats:
-                video_formats.sort(key=lambda x: x.get('height', 0), reverse=True)
-                best_format = video_formats[0]
-                stream_url = best_format.get('url')
+            # Single pass: highest height within the quality cap wins;
+            # track the overall best too in case nothing fits the cap
+            cap = self.settings.quality_cap
+            best_format = capped_format = None
+            best_height = capped_height = 0
+            for fmt in formats:
+                height = fmt.get('height')
+                if not height:
+                    continue
+                if height > best_height:
+                    best_height = height
+                    best_format = fmt
+                if cap and height <= cap and height > capped_height:
+                    capped_height = height
+                    capped_format = fmt
+
+            chosen = capped_format or best_format
+            if chosen is not None:
+                stream_url = chosen.get('url')
             else:
                 # Fallback to first available format
                 stream_url = formats[0].get('url')
@@ -439,47 +703,56 @@ class FreeTubeProvider:
             # Set resolved URL
             xbmcplugin.setResolvedUrl(self.handle, True, play_item)
             
-            # Add to history
-            if self.addon.getSetting('enable_watch_history') == 'true':
-                self.history.add_to_history(
-                    self.current_profile['profile_id'],
-                    video_id,
-                    video_info.get('title', ''),
-                    video_info.get('author'),
-                    video_info.get('channel_id'),
-                    video_info.get('length_seconds'),
-                    video_info.get('thumbnails', [{}])[0].get('url') if video_info.get('thumbnails') else None
-                )
+            # Add to history off the critical path: playback starts as
+            # soon as setResolvedUrl returns, while the SQLite insert
+            # finishes on its own thread (non-daemon, so a fast process
+            # exit doesn't drop the write)
+            if self.settings.enable_watch_history:
+                threading.Thread(
+                    target=self._record_history,
+                    args=(video_id, video_info),
+                ).start()
         
         except Exception as e:
             xbmc.log(f'[FreeTube] Playback error: {str(e)}', xbmc.LOGERROR)
             xbmcgui.Dialog().notification('FreeTube', 'Playback error', xbmcgui.NOTIFICATION_ERROR)
             xbmcplugin.setResolvedUrl(self.handle, False, xbmcgui.ListItem())
     
+    def _record_history(self, video_id, video_info):
+        """Write the watch-history row for a resolved video"""
+        try:
+            self.history.add_to_history(
+                self.current_profile['profile_id'],
+                video_id,
+                video_info.get('title', ''),
+                video_info.get('author'),
+                video_info.get('channel_id'),
+                video_info.get('length_seconds'),
+                video_info.get('thumbnails', [{}])[0].get('url') if video_info.get('thumbnails') else None
+            )
+        except Exception as e:
+            xbmc.log(f'[FreeTube] History write error: {str(e)}', xbmc.LOGERROR)
+    
+    # action -> (handler name, query-string params passed as kwargs)
+    _ROUTES = {
+        'main_menu': ('show_main_menu', ()),
+        'subscriptions': ('show_subscriptions', ()),
+        'subscriptions_feed': ('show_subscriptions_feed', ()),
+        'trending': ('show_trending', ()),
+        'search': ('search_videos', ('query',)),
+        'play': ('play_video', ('video_id',)),
+    }
+
     def route(self, params):
         """
         Route request to appropriate handler
-        
+
         Args:
             params: URL parameters dict
         """
         action = params.get('action', ['main_menu'])[0]
-        
-        if action == 'main_menu':
-            self.show_main_menu()
-        elif action == 'subscriptions':
-            self.show_subscriptions()
-        elif action == 'subscriptions_feed':
-            self.show_subscriptions_feed()
-        elif action == 'trending':
-            self.show_trending()
-        elif action == 'search':
-            query = params.get('query', [None])[0]
-            self.search_videos(query)
-        elif action == 'play':
-            video_id = params.get('video_id', [None])[0]
-            if video_id:
-                self.play_video(video_id)
-        else:
-            self.show_main_menu()
+
+        name, keys = self._ROUTES.get(action, ('show_main_menu', ()))
+        kwargs = {key: params.get(key, [None])[0] for key in keys}
+        getattr(self, name)(**kwargs)
 
@@ -14,15 +14,23 @@ from __future__ import absolute_import, division, unicode_literals
 
 import os
 import sqlite3
-import json
+import sys
+import threading
+import time
+import uuid
 from contextlib import contextmanager
 
+# Fast-path JSON for settings values and backup rows; re-exported here
+# so the storage managers keep importing from one place
+from .._json import json_dumps, json_loads
+
 try:
     import xbmc
     import xbmcaddon
     import xbmcvfs
     KODI_MODE = True
-    addon = xbmcaddon.Addon()
+    from .._kodi import get_addon
+    addon = get_addon()
     ADDON_ID = addon.getAddonInfo('id')
     ADDON_DATA_PATH = xbmcvfs.translatePath(addon.getAddonInfo('profile'))
 except ImportError:
@@ -30,6 +38,9 @@ except ImportError:
     ADDON_ID = 'plugin.video.freetube'
     ADDON_DATA_PATH = os.path.expanduser('~/.kodi/userdata/addon_data/' + ADDON_ID)
 
+# Default database location, joined once at import
+DEFAULT_DB_PATH = os.path.join(ADDON_DATA_PATH, 'freetube.db')
+
 
 class Database:
     """
@@ -39,7 +50,71 @@ class Database:
     
     DB_VERSION = 1
     DB_NAME = 'freetube.db'
-    
+
+    # mmap lets SQLite serve reads straight from the page cache without
+    # a pread copy per page; the mapping is address space, not resident
+    # memory, but 32-bit builds (older Android/ARMv7 boxes) get a
+    # smaller window to avoid exhausting theirs
+    _MMAP_SIZE = 268435456 if sys.maxsize > 2 ** 32 else 67108864
+
+    # WAL lets the prefetch/history writer threads commit without
+    # blocking UI-thread reads; the rest trades a little durability
+    # (NORMAL is still crash-safe in WAL mode) and memory for fewer
+    # fsyncs and disk reads. journal_mode sticks to the database file,
+    # the others are per-connection so they run on every open.
+    _CONNECTION_PRAGMAS = f'''
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA mmap_size={_MMAP_SIZE};
+        PRAGMA cache_size=-20000;
+        PRAGMA busy_timeout=5000;
+        PRAGMA foreign_keys=ON;
+    '''
+
+    # Non-unique indices, dropped during bulk restore and recreated in
+    # one scan afterwards; unique indices stay since they enforce the
+    # constraints the UPSERT paths rely on
+    _SECONDARY_INDICES = {
+        'idx_subscriptions_channel':
+            'CREATE INDEX IF NOT EXISTS idx_subscriptions_channel ON subscriptions(channel_id)',
+        'idx_subscriptions_profile_fetched':
+            'CREATE INDEX IF NOT EXISTS idx_subscriptions_profile_fetched ON subscriptions(profile_id, last_fetched)',
+        'idx_subscriptions_profile_name':
+            'CREATE INDEX IF NOT EXISTS idx_subscriptions_profile_name ON subscriptions(profile_id, channel_name)',
+        'idx_subscriptions_profile_date':
+            'CREATE INDEX IF NOT EXISTS idx_subscriptions_profile_date ON subscriptions(profile_id, subscribed_at DESC)',
+        'idx_history_video':
+            'CREATE INDEX IF NOT EXISTS idx_history_video ON history(video_id)',
+        'idx_history_profile_watched':
+            'CREATE INDEX IF NOT EXISTS idx_history_profile_watched ON history(profile_id, watched_at DESC)',
+        # The service's age-based cleanup deletes on watched_at alone,
+        # which the profile-led composite above cannot serve
+        'idx_history_watched_at':
+            'CREATE INDEX IF NOT EXISTS idx_history_watched_at ON history(watched_at)',
+        'idx_search_history_searched_at':
+            'CREATE INDEX IF NOT EXISTS idx_search_history_searched_at ON search_history(searched_at)',
+        'idx_playlists_profile_name':
+            'CREATE INDEX IF NOT EXISTS idx_playlists_profile_name ON playlists(profile_id, name)',
+        'idx_playlist_videos_playlist_pos':
+            'CREATE INDEX IF NOT EXISTS idx_playlist_videos_playlist_pos ON playlist_videos(playlist_id, position)',
+        'idx_search_history_profile':
+            'CREATE INDEX IF NOT EXISTS idx_search_history_profile ON search_history(profile_id)',
+    }
+
+    # Bumps the parent playlist's updated_at whenever a video lands in
+    # it, so add paths don't need a separate UPDATE statement. Fires
+    # only on real inserts - rows skipped by INSERT OR IGNORE don't
+    # touch the timestamp.
+    _PLAYLIST_TOUCH_TRIGGER = '''
+        CREATE TRIGGER IF NOT EXISTS playlist_videos_touch_ai
+        AFTER INSERT ON playlist_videos
+        BEGIN
+            UPDATE playlists SET updated_at = new.added_at
+            WHERE playlist_id = new.playlist_id;
+        END
+    '''
+
     def __init__(self, db_path=None):
         """
         Initialize database
@@ -50,29 +125,49 @@ class Database:
         if db_path:
             self.db_path = db_path
         else:
-            # Create addon data directory if it doesn't exist
-            if not os.path.exists(ADDON_DATA_PATH):
-                os.makedirs(ADDON_DATA_PATH)
-            self.db_path = os.path.join(ADDON_DATA_PATH, self.DB_NAME)
-        
+            # exist_ok avoids the separate stat and its TOCTOU race
+            os.makedirs(ADDON_DATA_PATH, exist_ok=True)
+            self.db_path = DEFAULT_DB_PATH
+
+        self._conn = None
+        self._lock = threading.RLock()
         self._initialize_database()
-    
+
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-        try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Database error: {str(e)}', xbmc.LOGERROR)
-            raise
-        finally:
-            conn.close()
-    
+        """
+        Context manager yielding the shared database connection
+
+        One long-lived connection per Database instance: connect-per-call
+        reparsed the schema and threw away the page cache on every
+        query. The lock serializes access from the background
+        prefetch/history threads (check_same_thread is off for the same
+        reason); commit on normal exit, rollback on exception.
+        """
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                       cached_statements=256)
+                conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+                conn.executescript(self._CONNECTION_PRAGMAS)
+                self._conn = conn
+
+            try:
+                yield self._conn
+                self._conn.commit()
+            except Exception as e:
+                self._conn.rollback()
+                if KODI_MODE:
+                    xbmc.log(f'[FreeTube] Database error: {str(e)}', xbmc.LOGERROR)
+                raise
+
+    def close(self):
+        """Close the shared connection (call on addon shutdown)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
     def _initialize_database(self):
         """Create database tables if they don't exist"""
         with self._get_connection() as conn:
@@ -100,10 +195,17 @@ class Database:
                     channel_name TEXT NOT NULL,
                     channel_thumbnail TEXT,
                     subscribed_at INTEGER NOT NULL,
+                    last_fetched INTEGER DEFAULT 0,
                     UNIQUE(profile_id, channel_id),
                     FOREIGN KEY (profile_id) REFERENCES profiles(profile_id) ON DELETE CASCADE
                 )
             ''')
+
+            # Migration for databases created before last_fetched existed
+            cursor.execute('PRAGMA table_info(subscriptions)')
+            columns = {row[1] for row in cursor.fetchall()}
+            if 'last_fetched' not in columns:
+                cursor.execute('ALTER TABLE subscriptions ADD COLUMN last_fetched INTEGER DEFAULT 0')
             
             # Watch history table
             cursor.execute('''
@@ -175,27 +277,142 @@ class Database:
             ''')
             
             # Create indices for better performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_subscriptions_profile ON subscriptions(profile_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_subscriptions_channel ON subscriptions(channel_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_profile ON history(profile_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_video ON history(video_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_history_watched_at ON history(watched_at DESC)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_playlists_profile ON playlists(profile_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_playlist_videos_playlist ON playlist_videos(playlist_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_history_profile ON search_history(profile_id)')
+            for create_sql in self._SECONDARY_INDICES.values():
+                cursor.execute(create_sql)
+            cursor.execute(self._PLAYLIST_TOUCH_TRIGGER)
+            # One history row per (profile, video), enforced with a
+            # unique index so history writes can use an UPSERT. The
+            # dedupe of rows from before the index existed (keeping
+            # the latest) is a one-time migration: once the index is
+            # present it has already run, so later startups skip the
+            # full-table scan.
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_history_profile_video'"
+            )
+            if cursor.fetchone() is None:
+                cursor.execute('''
+                    DELETE FROM history WHERE id NOT IN (
+                        SELECT MAX(id) FROM history GROUP BY profile_id, video_id
+                    )
+                ''')
+                cursor.execute('CREATE UNIQUE INDEX idx_history_profile_video ON history(profile_id, video_id)')
+            # get_history filters by profile and orders by watched_at;
+            # this composite serves both in one pass. The single-column
+            # profile and watched_at indices it obsoletes are dropped.
+            cursor.execute('DROP INDEX IF EXISTS idx_history_profile')
+            # Single-column indices subsumed by composite ones whose
+            # leading column they duplicate
+            cursor.execute('DROP INDEX IF EXISTS idx_subscriptions_profile')
+            cursor.execute('DROP INDEX IF EXISTS idx_playlists_profile')
+            cursor.execute('DROP INDEX IF EXISTS idx_playlist_videos_playlist')
             
+            # Full-text index over history titles; LIKE '%q%' cannot use
+            # an index and scans the whole table. Optional - some Kodi
+            # builds ship SQLite without FTS5, so failure just leaves
+            # the LIKE fallback in place.
+            self.fts_enabled = self._initialize_history_fts(cursor)
+            self.subs_fts_enabled = self._initialize_subscriptions_fts(cursor)
+
             # Check if we need to create default profile
-            cursor.execute('SELECT COUNT(*) FROM profiles')
-            if cursor.fetchone()[0] == 0:
+            cursor.execute('SELECT 1 FROM profiles LIMIT 1')
+            if cursor.fetchone() is None:
                 self._create_default_profile(cursor)
             
             conn.commit()
     
+    def _initialize_history_fts(self, cursor):
+        """
+        Create the history_fts virtual table and sync triggers
+
+        External-content FTS5 table over history(title), kept in sync
+        by AFTER INSERT/UPDATE/DELETE triggers; rebuilt from existing
+        rows on first creation.
+
+        Args:
+            cursor: Open cursor inside the init transaction
+
+        Returns:
+            bool: True when FTS5 is available and set up
+        """
+        try:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'history_fts'")
+            fresh = cursor.fetchone() is None
+
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+                    title,
+                    content='history',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+            cursor.executescript('''
+                CREATE TRIGGER IF NOT EXISTS history_fts_ai AFTER INSERT ON history BEGIN
+                    INSERT INTO history_fts(rowid, title) VALUES (new.id, new.title);
+                END;
+                CREATE TRIGGER IF NOT EXISTS history_fts_ad AFTER DELETE ON history BEGIN
+                    INSERT INTO history_fts(history_fts, rowid, title) VALUES ('delete', old.id, old.title);
+                END;
+                CREATE TRIGGER IF NOT EXISTS history_fts_au AFTER UPDATE OF title ON history BEGIN
+                    INSERT INTO history_fts(history_fts, rowid, title) VALUES ('delete', old.id, old.title);
+                    INSERT INTO history_fts(rowid, title) VALUES (new.id, new.title);
+                END;
+            ''')
+
+            if fresh:
+                cursor.execute("INSERT INTO history_fts(history_fts) VALUES ('rebuild')")
+
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def _initialize_subscriptions_fts(self, cursor):
+        """
+        Create the subscriptions_fts virtual table and sync triggers
+
+        Same external-content FTS5 arrangement as history_fts, indexing
+        subscriptions(channel_name) for sub-linear channel search.
+
+        Args:
+            cursor: Open cursor inside the init transaction
+
+        Returns:
+            bool: True when FTS5 is available and set up
+        """
+        try:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'subscriptions_fts'")
+            fresh = cursor.fetchone() is None
+
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS subscriptions_fts USING fts5(
+                    channel_name,
+                    content='subscriptions',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+            cursor.executescript('''
+                CREATE TRIGGER IF NOT EXISTS subscriptions_fts_ai AFTER INSERT ON subscriptions BEGIN
+                    INSERT INTO subscriptions_fts(rowid, channel_name) VALUES (new.id, new.channel_name);
+                END;
+                CREATE TRIGGER IF NOT EXISTS subscriptions_fts_ad AFTER DELETE ON subscriptions BEGIN
+                    INSERT INTO subscriptions_fts(subscriptions_fts, rowid, channel_name) VALUES ('delete', old.id, old.channel_name);
+                END;
+                CREATE TRIGGER IF NOT EXISTS subscriptions_fts_au AFTER UPDATE OF channel_name ON subscriptions BEGIN
+                    INSERT INTO subscriptions_fts(subscriptions_fts, rowid, channel_name) VALUES ('delete', old.id, old.channel_name);
+                    INSERT INTO subscriptions_fts(rowid, channel_name) VALUES (new.id, new.channel_name);
+                END;
+            ''')
+
+            if fresh:
+                cursor.execute("INSERT INTO subscriptions_fts(subscriptions_fts) VALUES ('rebuild')")
+
+            return True
+        except sqlite3.OperationalError:
+            return False
+
     def _create_default_profile(self, cursor):
         """Create default profile on first run"""
-        import time
-        import uuid
-        
         profile_id = str(uuid.uuid4())
         now = int(time.time())
         
@@ -233,11 +450,27 @@ class Database:
         Args:
             query: SQL query string
             params_list: List of parameter tuples
+
+        Returns:
+            int: Number of affected rows (ignored conflicts excluded)
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.executemany(query, params_list)
+            return cursor.rowcount
     
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager yielding a cursor for multi-statement work
+
+        Everything executed on the cursor shares one commit (and one
+        fsync) when the block exits, instead of paying a commit per
+        execute() call.
+        """
+        with self._get_connection() as conn:
+            yield conn.cursor()
+
     def get_setting(self, key, default=None):
         """
         Get setting value
@@ -252,8 +485,8 @@ class Database:
         result = self.execute('SELECT value FROM settings WHERE key = ?', (key,))
         if result:
             try:
-                return json.loads(result[0]['value'])
-            except (json.JSONDecodeError, KeyError):
+                return json_loads(result[0]['value'])
+            except (ValueError, KeyError):
                 return result[0]['value']
         return default
     
@@ -265,9 +498,7 @@ class Database:
             key: Setting key
             value: Setting value (will be JSON encoded)
         """
-        import time
-        
-        value_str = json.dumps(value) if not isinstance(value, str) else value
+        value_str = json_dumps(value) if not isinstance(value, str) else value
         now = int(time.time())
         
         with self._get_connection() as conn:
@@ -277,8 +508,16 @@ class Database:
                 VALUES (?, ?, ?)
             ''', (key, value_str, now))
     
-    def clear_all_data(self):
-        """Clear all data from database (except settings)"""
+    def clear_all_data(self, vacuum=True):
+        """
+        Clear all data from database (except settings)
+
+        Args:
+            vacuum: Reclaim freed pages after clearing
+        """
+        # All six DELETEs plus the default-profile INSERT commit as one
+        # transaction; the bare DELETE FROM form keeps SQLite's
+        # truncate optimization
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM playlist_videos')
@@ -287,49 +526,59 @@ class Database:
             cursor.execute('DELETE FROM search_history')
             cursor.execute('DELETE FROM subscriptions')
             cursor.execute('DELETE FROM profiles')
-            
+
             # Recreate default profile
             self._create_default_profile(cursor)
-        
+
+        if vacuum:
+            # VACUUM cannot run inside a transaction, so it goes after
+            # the commit above
+            with self._lock:
+                self._conn.execute('VACUUM')
+
         if KODI_MODE:
             xbmc.log('[FreeTube] All data cleared', xbmc.LOGINFO)
     
+    EXPORT_TABLES = ('profiles', 'subscriptions', 'history', 'playlists',
+                     'playlist_videos', 'search_history')
+
+    def export_data_iter(self):
+        """
+        Stream all data for backup, one row at a time
+
+        Yields (table, row_dict) pairs while iterating the cursor in
+        fetchmany batches, so a multi-year history never has to sit in
+        memory as one giant dict. Callers writing backups should stream
+        these straight to disk.
+
+        Yields:
+            tuple: (table name, row dict)
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = 1000
+
+            for table in self.EXPORT_TABLES:
+                cursor.execute(f'SELECT * FROM {table}')
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield table, dict(row)
+
     def export_data(self):
         """
         Export all data for backup
-        
+
         Returns:
-            dict: All database data
+            dict: All database data, keyed by table
         """
-        data = {}
-        
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Export profiles
-            cursor.execute('SELECT * FROM profiles')
-            data['profiles'] = [dict(row) for row in cursor.fetchall()]
-            
-            # Export subscriptions
-            cursor.execute('SELECT * FROM subscriptions')
-            data['subscriptions'] = [dict(row) for row in cursor.fetchall()]
-            
-            # Export history
-            cursor.execute('SELECT * FROM history')
-            data['history'] = [dict(row) for row in cursor.fetchall()]
-            
-            # Export playlists
-            cursor.execute('SELECT * FROM playlists')
-            data['playlists'] = [dict(row) for row in cursor.fetchall()]
-            
-            # Export playlist videos
-            cursor.execute('SELECT * FROM playlist_videos')
-            data['playlist_videos'] = [dict(row) for row in cursor.fetchall()]
-            
-            # Export search history
-            cursor.execute('SELECT * FROM search_history')
-            data['search_history'] = [dict(row) for row in cursor.fetchall()]
-        
+        data = {table: [] for table in self.EXPORT_TABLES}
+
+        for table, row in self.export_data_iter():
+            data[table].append(row)
+
         return data
     
     def import_data(self, data):
@@ -341,103 +590,163 @@ class Database:
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Clear existing data
-            cursor.execute('DELETE FROM playlist_videos')
-            cursor.execute('DELETE FROM playlists')
-            cursor.execute('DELETE FROM history')
-            cursor.execute('DELETE FROM search_history')
-            cursor.execute('DELETE FROM subscriptions')
-            cursor.execute('DELETE FROM profiles')
-            
-            # Import profiles
-            for profile in data.get('profiles', []):
-                cursor.execute('''
-                    INSERT INTO profiles (profile_id, name, color, is_default, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    profile['profile_id'],
-                    profile['name'],
-                    profile['color'],
-                    profile['is_default'],
-                    profile['created_at'],
-                    profile['updated_at']
-                ))
-            
-            # Import subscriptions
-            for sub in data.get('subscriptions', []):
-                cursor.execute('''
-                    INSERT INTO subscriptions 
-                    (profile_id, channel_id, channel_name, channel_thumbnail, subscribed_at)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    sub['profile_id'],
-                    sub['channel_id'],
-                    sub['channel_name'],
-                    sub.get('channel_thumbnail'),
-                    sub['subscribed_at']
-                ))
-            
-            # Import history
-            for item in data.get('history', []):
-                cursor.execute('''
-                    INSERT INTO history 
-                    (profile_id, video_id, title, author, channel_id, length_seconds, 
-                     thumbnail, watched_at, watch_progress)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    item['profile_id'],
-                    item['video_id'],
-                    item['title'],
-                    item.get('author'),
-                    item.get('channel_id'),
-                    item.get('length_seconds'),
-                    item.get('thumbnail'),
-                    item['watched_at'],
-                    item.get('watch_progress', 0)
-                ))
-            
-            # Import playlists
-            for playlist in data.get('playlists', []):
-                cursor.execute('''
-                    INSERT INTO playlists 
-                    (profile_id, playlist_id, name, description, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    playlist['profile_id'],
-                    playlist['playlist_id'],
-                    playlist['name'],
-                    playlist.get('description'),
-                    playlist['created_at'],
-                    playlist['updated_at']
-                ))
-            
-            # Import playlist videos
-            for video in data.get('playlist_videos', []):
-                cursor.execute('''
-                    INSERT INTO playlist_videos 
-                    (playlist_id, video_id, title, author, channel_id, length_seconds, 
-                     thumbnail, position, added_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    video['playlist_id'],
-                    video['video_id'],
-                    video['title'],
-                    video.get('author'),
-                    video.get('channel_id'),
-                    video.get('length_seconds'),
-                    video.get('thumbnail'),
-                    video['position'],
-                    video['added_at']
-                ))
-            
-            # Import search history
-            for search in data.get('search_history', []):
-                cursor.execute('''
-                    INSERT INTO search_history (profile_id, query, searched_at)
-                    VALUES (?, ?, ?)
-                ''', (search['profile_id'], search['query'], search['searched_at']))
-        
+
+            # Defer foreign-key checks to the end of the transaction so
+            # tables load in bulk without per-row parent lookups; a
+            # savepoint makes the whole restore atomic - any failure
+            # rolls back to the pre-import state in one step
+            cursor.execute('PRAGMA defer_foreign_keys = ON')
+            cursor.execute('SAVEPOINT restore')
+            try:
+                self._import_tables(cursor, data)
+                cursor.execute('RELEASE SAVEPOINT restore')
+            except Exception:
+                cursor.execute('ROLLBACK TO SAVEPOINT restore')
+                cursor.execute('RELEASE SAVEPOINT restore')
+                raise
+
         if KODI_MODE:
             xbmc.log('[FreeTube] Data imported successfully', xbmc.LOGINFO)
 
+    def _import_tables(self, cursor, data):
+        """Replace all table contents from a backup dict"""
+        # Clear existing data
+        cursor.execute('DELETE FROM playlist_videos')
+        cursor.execute('DELETE FROM playlists')
+        cursor.execute('DELETE FROM history')
+        cursor.execute('DELETE FROM search_history')
+        cursor.execute('DELETE FROM subscriptions')
+        cursor.execute('DELETE FROM profiles')
+        
+        # Bulk load without live secondary indices: dropping them
+        # first avoids a B-tree update per inserted row; one
+        # CREATE INDEX scan per index afterwards rebuilds them
+        for name in self._SECONDARY_INDICES:
+            cursor.execute(f'DROP INDEX IF EXISTS {name}')
+
+        # The playlist touch trigger would overwrite each restored
+        # playlist's updated_at with the bulk-loaded videos' added_at;
+        # drop it for the load and put it back afterwards
+        cursor.execute('DROP TRIGGER IF EXISTS playlist_videos_touch_ai')
+
+        # Batched inserts: one executemany per table crosses the
+        # Python/sqlite3 boundary once per table instead of once
+        # per row, all inside the surrounding single transaction.
+        # Generator expressions keep memory flat on large backups.
+        cursor.executemany('''
+            INSERT INTO profiles (profile_id, name, color, is_default, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            (
+                profile['profile_id'],
+                profile['name'],
+                profile['color'],
+                profile['is_default'],
+                profile['created_at'],
+                profile['updated_at']
+            )
+            for profile in data.get('profiles', [])
+        ))
+
+        cursor.executemany('''
+            INSERT INTO subscriptions
+            (profile_id, channel_id, channel_name, channel_thumbnail, subscribed_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (
+            (
+                sub['profile_id'],
+                sub['channel_id'],
+                sub['channel_name'],
+                sub.get('channel_thumbnail'),
+                sub['subscribed_at']
+            )
+            for sub in data.get('subscriptions', [])
+        ))
+
+        # Backups from before the (profile_id, video_id) unique index
+        # existed can contain duplicate history rows; the UPSERT keeps
+        # the most recent watch instead of aborting the whole restore.
+        # The unique index itself is created outside _SECONDARY_INDICES
+        # and stays live through the load, so ON CONFLICT can target it.
+        cursor.executemany('''
+            INSERT INTO history
+            (profile_id, video_id, title, author, channel_id, length_seconds,
+             thumbnail, watched_at, watch_progress)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(profile_id, video_id) DO UPDATE SET
+                title = excluded.title,
+                author = excluded.author,
+                channel_id = excluded.channel_id,
+                length_seconds = excluded.length_seconds,
+                thumbnail = excluded.thumbnail,
+                watched_at = excluded.watched_at,
+                watch_progress = excluded.watch_progress
+            WHERE excluded.watched_at >= history.watched_at
+        ''', (
+            (
+                item['profile_id'],
+                item['video_id'],
+                item['title'],
+                item.get('author'),
+                item.get('channel_id'),
+                item.get('length_seconds'),
+                item.get('thumbnail'),
+                item['watched_at'],
+                item.get('watch_progress', 0)
+            )
+            for item in data.get('history', [])
+        ))
+
+        cursor.executemany('''
+            INSERT INTO playlists
+            (profile_id, playlist_id, name, description, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            (
+                playlist['profile_id'],
+                playlist['playlist_id'],
+                playlist['name'],
+                playlist.get('description'),
+                playlist['created_at'],
+                playlist['updated_at']
+            )
+            for playlist in data.get('playlists', [])
+        ))
+
+        cursor.executemany('''
+            INSERT INTO playlist_videos
+            (playlist_id, video_id, title, author, channel_id, length_seconds,
+             thumbnail, position, added_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            (
+                video['playlist_id'],
+                video['video_id'],
+                video['title'],
+                video.get('author'),
+                video.get('channel_id'),
+                video.get('length_seconds'),
+                video.get('thumbnail'),
+                video['position'],
+                video['added_at']
+            )
+            for video in data.get('playlist_videos', [])
+        ))
+
+        cursor.executemany('''
+            INSERT INTO search_history (profile_id, query, searched_at)
+            VALUES (?, ?, ?)
+        ''', (
+            (search['profile_id'], search['query'], search['searched_at'])
+            for search in data.get('search_history', [])
+        ))
+
+        for create_sql in self._SECONDARY_INDICES.values():
+            cursor.execute(create_sql)
+        cursor.execute(self._PLAYLIST_TOUCH_TRIGGER)
+
+        # Refresh planner statistics after the bulk load so the new
+        # table sizes inform index selection
+        cursor.execute('ANALYZE')
+    
+
@@ -12,7 +12,12 @@
 
 from __future__ import absolute_import, division, unicode_literals
 
+import queue
+import threading
 import time
+from functools import lru_cache
+
+from .database import json_dumps, json_loads
 
 try:
     import xbmc
@@ -21,8 +26,94 @@ except ImportError:
     KODI_MODE = False
 
 
+# SQL hoisted to module scope: the persistent connection's statement
+# cache is keyed by the query string, so reusing the same constant
+# guarantees a hit instead of re-preparing per call
+_SQL_HISTORY_UPSERT = '''
+    INSERT INTO history
+    (profile_id, video_id, title, author, channel_id, length_seconds,
+     thumbnail, watched_at, watch_progress)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(profile_id, video_id) DO UPDATE SET
+        title = excluded.title,
+        author = excluded.author,
+        channel_id = excluded.channel_id,
+        length_seconds = excluded.length_seconds,
+        thumbnail = excluded.thumbnail,
+        watched_at = excluded.watched_at,
+        watch_progress = excluded.watch_progress
+'''
+
+_SQL_HISTORY_DELETE = '''
+    DELETE FROM history
+    WHERE profile_id = ? AND video_id = ?
+'''
+
+_SQL_HISTORY_GET = '''
+    SELECT * FROM history
+    WHERE profile_id = ?
+    ORDER BY watched_at DESC
+    LIMIT ? OFFSET ?
+'''
+
+_SQL_HISTORY_PAGE_FIRST = '''
+    SELECT * FROM history
+    WHERE profile_id = ?
+    ORDER BY watched_at DESC, id DESC
+    LIMIT ?
+'''
+
+_SQL_HISTORY_PAGE_NEXT = '''
+    SELECT * FROM history
+    WHERE profile_id = ?
+      AND (watched_at < ? OR (watched_at = ? AND id < ?))
+    ORDER BY watched_at DESC, id DESC
+    LIMIT ?
+'''
+
+_SQL_HISTORY_COUNT = '''
+    SELECT COUNT(*) as count FROM history
+    WHERE profile_id = ?
+'''
+
+_SQL_HISTORY_SEARCH_FTS = '''
+    SELECT h.* FROM history h
+    JOIN history_fts f ON h.id = f.rowid
+    WHERE f.title MATCH ? AND h.profile_id = ?
+    ORDER BY h.watched_at DESC
+'''
+
+_SQL_HISTORY_SEARCH_LIKE = '''
+    SELECT * FROM history
+    WHERE profile_id = ? AND title LIKE ?
+    ORDER BY watched_at DESC
+'''
+
+_SQL_HISTORY_EXISTS = '''
+    SELECT EXISTS(
+        SELECT 1 FROM history
+        WHERE profile_id = ? AND video_id = ?
+    ) as found
+'''
+
+_SQL_HISTORY_PROGRESS = '''
+    SELECT watch_progress FROM history
+    WHERE profile_id = ? AND video_id = ?
+'''
+
+_SQL_HISTORY_ITER = '''
+    SELECT * FROM history
+    WHERE profile_id = ?
+    ORDER BY watched_at DESC
+'''
+
+
 class HistoryManager:
     """Manage local watch history"""
+
+    # Imports larger than this move to the threaded writer
+    ASYNC_IMPORT_THRESHOLD = 1000
+
     
     def __init__(self, database):
         """
@@ -32,7 +123,17 @@ class HistoryManager:
             database: Database instance
         """
         self.db = database
-    
+        # Per-item UI queries (watched badge, resume point) repeat for
+        # the same video across a listing; memoize per manager instance
+        # and drop everything on any write
+        self._is_in_history_cached = lru_cache(maxsize=2048)(self._query_is_in_history)
+        self._watch_progress_cached = lru_cache(maxsize=2048)(self._query_watch_progress)
+
+    def _invalidate_caches(self):
+        """Drop memoized read results after a history write"""
+        self._is_in_history_cached.cache_clear()
+        self._watch_progress_cached.cache_clear()
+
     def add_to_history(self, profile_id, video_id, title, author=None, channel_id=None,
                        length_seconds=None, thumbnail=None, watch_progress=0):
         """
@@ -52,33 +153,16 @@ class HistoryManager:
             bool: True if added successfully
         """
         now = int(time.time())
-        
+
         try:
-            # Check if video already in history
-            existing = self.db.execute('''
-                SELECT id FROM history 
-                WHERE profile_id = ? AND video_id = ?
-            ''', (profile_id, video_id))
-            
-            if existing:
-                # Update existing entry
-                self.db.execute('''
-                    UPDATE history 
-                    SET title = ?, author = ?, channel_id = ?, length_seconds = ?, 
-                        thumbnail = ?, watched_at = ?, watch_progress = ?
-                    WHERE profile_id = ? AND video_id = ?
-                ''', (title, author, channel_id, length_seconds, thumbnail, now, 
-                     watch_progress, profile_id, video_id))
-            else:
-                # Insert new entry
-                self.db.execute('''
-                    INSERT INTO history 
-                    (profile_id, video_id, title, author, channel_id, length_seconds, 
-                     thumbnail, watched_at, watch_progress)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (profile_id, video_id, title, author, channel_id, length_seconds, 
-                     thumbnail, now, watch_progress))
-            
+            # Single UPSERT through the (profile_id, video_id) unique
+            # index - one statement instead of SELECT then
+            # INSERT-or-UPDATE, with no race between the two
+            self.db.execute(_SQL_HISTORY_UPSERT,
+                (profile_id, video_id, title, author, channel_id, length_seconds,
+                 thumbnail, now, watch_progress))
+
+            self._invalidate_caches()
             return True
         except Exception as e:
             if KODI_MODE:
@@ -97,10 +181,8 @@ class HistoryManager:
             bool: True if removed successfully
         """
         try:
-            self.db.execute('''
-                DELETE FROM history 
-                WHERE profile_id = ? AND video_id = ?
-            ''', (profile_id, video_id))
+            self.db.execute(_SQL_HISTORY_DELETE, (profile_id, video_id))
+            self._invalidate_caches()
             return True
         except Exception as e:
             if KODI_MODE:
@@ -119,6 +201,7 @@ class HistoryManager:
         """
         try:
             self.db.execute('DELETE FROM history WHERE profile_id = ?', (profile_id,))
+            self._invalidate_caches()
             if KODI_MODE:
                 xbmc.log('[FreeTube] History cleared', xbmc.LOGINFO)
             return True
@@ -135,19 +218,72 @@ class HistoryManager:
             profile_id: Profile ID
             limit: Maximum number of items
             offset: Offset for pagination
-            
+
         Returns:
-            list: History items
+            list: History rows (sqlite3.Row, mapping access by column name)
         """
-        result = self.db.execute('''
-            SELECT * FROM history 
-            WHERE profile_id = ?
-            ORDER BY watched_at DESC
-            LIMIT ? OFFSET ?
-        ''', (profile_id, limit, offset))
-        
-        return [dict(row) for row in result]
-    
+        # Rows support row['column'] directly; skipping the per-row dict
+        # copy avoids allocating every column twice on large pages.
+        # Callers that serialize convert with dict(row) at that boundary.
+        return self.db.execute(_SQL_HISTORY_GET, (profile_id, limit, offset))
+
+    def get_history_page(self, profile_id, limit=100, cursor=None):
+        """
+        Get one page of watch history via keyset pagination
+
+        OFFSET makes SQLite walk and discard every skipped row, so deep
+        pages get slower the further in they are. Seeking past the last
+        row of the previous page on (watched_at, id) instead makes every
+        page the same cost, served by the (profile_id, watched_at)
+        index with id as the tie-breaker.
+
+        Args:
+            profile_id: Profile ID
+            limit: Maximum number of items per page
+            cursor: (watched_at, id) of the last row of the previous
+                page, or None for the first page
+
+        Returns:
+            tuple: (rows, next_cursor) - next_cursor is None when this
+                was the last page
+        """
+        if cursor is None:
+            rows = self.db.execute(_SQL_HISTORY_PAGE_FIRST, (profile_id, limit))
+        else:
+            watched_at, row_id = cursor
+            rows = self.db.execute(
+                _SQL_HISTORY_PAGE_NEXT,
+                (profile_id, watched_at, watched_at, row_id, limit))
+
+        if len(rows) < limit:
+            return rows, None
+
+        last = rows[-1]
+        return rows, (last['watched_at'], last['id'])
+
+    def iter_history(self, profile_id, chunk_size=500):
+        """
+        Stream watch history rows, newest first
+
+        Yields rows in fetchmany batches instead of materializing the
+        whole history, keeping export memory flat regardless of size.
+
+        Args:
+            profile_id: Profile ID
+            chunk_size: Rows fetched per batch
+
+        Yields:
+            sqlite3.Row: History row
+        """
+        with self.db._get_connection() as conn:
+            cursor = conn.execute(_SQL_HISTORY_ITER, (profile_id,))
+
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+
     def get_history_count(self, profile_id):
         """
         Get history count
@@ -158,10 +294,7 @@ class HistoryManager:
         Returns:
             int: Number of history items
         """
-        result = self.db.execute('''
-            SELECT COUNT(*) as count FROM history 
-            WHERE profile_id = ?
-        ''', (profile_id,))
+        result = self.db.execute(_SQL_HISTORY_COUNT, (profile_id,))
         
         return result[0]['count'] if result else 0
     
@@ -174,15 +307,18 @@ class HistoryManager:
             query: Search query
             
         Returns:
-            list: Matching history items
+            list: Matching history rows (sqlite3.Row)
         """
-        result = self.db.execute('''
-            SELECT * FROM history 
-            WHERE profile_id = ? AND title LIKE ?
-            ORDER BY watched_at DESC
-        ''', (profile_id, f'%{query}%'))
-        
-        return [dict(row) for row in result]
+        if getattr(self.db, 'fts_enabled', False):
+            # Prefix phrase match against the inverted index; quoting
+            # the query keeps FTS operators in user input literal
+            match = '"{}"*'.format(query.replace('"', '""'))
+            try:
+                return self.db.execute(_SQL_HISTORY_SEARCH_FTS, (match, profile_id))
+            except Exception:
+                pass  # Fall back to the LIKE scan below
+
+        return self.db.execute(_SQL_HISTORY_SEARCH_LIKE, (profile_id, f'%{query}%'))
     
     def is_in_history(self, profile_id, video_id):
         """
@@ -195,29 +331,32 @@ class HistoryManager:
         Returns:
             bool: True if in history
         """
-        result = self.db.execute('''
-            SELECT COUNT(*) as count FROM history 
-            WHERE profile_id = ? AND video_id = ?
-        ''', (profile_id, video_id))
-        
-        return result[0]['count'] > 0 if result else False
-    
+        return self._is_in_history_cached(profile_id, video_id)
+
+    def _query_is_in_history(self, profile_id, video_id):
+        """Uncached membership query backing is_in_history"""
+        # EXISTS stops at the first index hit instead of counting
+        result = self.db.execute(_SQL_HISTORY_EXISTS, (profile_id, video_id))
+
+        return bool(result[0]['found']) if result else False
+
     def get_watch_progress(self, profile_id, video_id):
         """
         Get watch progress for a video
-        
+
         Args:
             profile_id: Profile ID
             video_id: YouTube video ID
-            
+
         Returns:
             float: Watch progress (0-1) or None
         """
-        result = self.db.execute('''
-            SELECT watch_progress FROM history 
-            WHERE profile_id = ? AND video_id = ?
-        ''', (profile_id, video_id))
-        
+        return self._watch_progress_cached(profile_id, video_id)
+
+    def _query_watch_progress(self, profile_id, video_id):
+        """Uncached progress query backing get_watch_progress"""
+        result = self.db.execute(_SQL_HISTORY_PROGRESS, (profile_id, video_id))
+
         return result[0]['watch_progress'] if result else None
     
     def export_history(self, profile_id):
@@ -230,12 +369,10 @@ class HistoryManager:
         Returns:
             str: JSON lines format (FreeTube compatible)
         """
-        history = self.get_history(profile_id, limit=999999)
-        
-        lines = []
-        for item in history:
-            import json
-            lines.append(json.dumps({
+        history = self.iter_history(profile_id)
+
+        return '\n'.join(
+            json_dumps({
                 'video_id': item['video_id'],
                 'title': item['title'],
                 'author': item['author'],
@@ -244,9 +381,9 @@ class HistoryManager:
                 'thumbnail': item['thumbnail'],
                 'watched_at': item['watched_at'],
                 'watch_progress': item['watch_progress']
-            }))
-        
-        return '\n'.join(lines) + '\n'
+            })
+            for item in history
+        ) + '\n'
     
     def import_history(self, profile_id, history_data, clear_existing=False):
         """
@@ -262,39 +399,104 @@ class HistoryManager:
         """
         if clear_existing:
             self.clear_history(profile_id)
-        
-        # Parse history data
+
+        rows = self._build_import_rows(profile_id, history_data)
+
+        # Large backups overlap JSON parsing with the database writes;
+        # small ones go through a single executemany directly
+        if len(rows) > self.ASYNC_IMPORT_THRESHOLD:
+            imported = self._import_rows_threaded(rows)
+        else:
+            try:
+                self.db.execute_many(_SQL_HISTORY_UPSERT, rows)
+                self._invalidate_caches()
+                imported = len(rows)
+            except Exception as e:
+                if KODI_MODE:
+                    xbmc.log(f'[FreeTube] History import error: {str(e)}', xbmc.LOGERROR)
+                imported = 0
+
+        if KODI_MODE:
+            xbmc.log(f'[FreeTube] Imported {imported} history items', xbmc.LOGINFO)
+
+        return imported
+
+    def _build_import_rows(self, profile_id, history_data):
+        """Parse import input into UPSERT parameter tuples"""
         if isinstance(history_data, str):
-            import json
             items = []
             for line in history_data.strip().split('\n'):
                 if line:
                     try:
-                        items.append(json.loads(line))
-                    except json.JSONDecodeError:
+                        items.append(json_loads(line))
+                    except ValueError:
                         continue
         else:
             items = history_data
-        
-        imported = 0
-        for item in items:
+
+        now = int(time.time())
+        return [
+            (
+                profile_id,
+                item['video_id'],
+                item['title'],
+                item.get('author'),
+                item.get('channel_id'),
+                item.get('length_seconds'),
+                item.get('thumbnail'),
+                item.get('watched_at', now),
+                item.get('watch_progress', 0)
+            )
+            for item in items
+            if item.get('video_id') and item.get('title') is not None
+        ]
+
+    def _import_rows_threaded(self, rows, batch_size=500):
+        """
+        Write import rows from a worker thread in bounded batches
+
+        The caller feeds a small queue while a writer thread drains it
+        with one executemany per batch inside a single transaction;
+        with WAL enabled, UI reads keep running while the bulk write
+        proceeds.
+
+        Args:
+            rows: UPSERT parameter tuples
+            batch_size: Rows per executemany batch
+
+        Returns:
+            int: Number of imported rows
+        """
+        pending = queue.Queue(maxsize=4)
+        failed = []
+
+        def _writer():
             try:
-                self.add_to_history(
-                    profile_id,
-                    item['video_id'],
-                    item['title'],
-                    item.get('author'),
-                    item.get('channel_id'),
-                    item.get('length_seconds'),
-                    item.get('thumbnail'),
-                    item.get('watch_progress', 0)
-                )
-                imported += 1
-            except Exception:
-                continue
-        
-        if KODI_MODE:
-            xbmc.log(f'[FreeTube] Imported {imported} history items', xbmc.LOGINFO)
-        
-        return imported
+                with self.db._get_connection() as conn:
+                    cursor = conn.cursor()
+                    while True:
+                        batch = pending.get()
+                        if batch is None:
+                            break
+                        cursor.executemany(_SQL_HISTORY_UPSERT, batch)
+            except Exception as e:
+                failed.append(e)
+                # Keep draining so the producer never blocks forever
+                while pending.get() is not None:
+                    pass
+
+        writer = threading.Thread(target=_writer)
+        writer.start()
+        for start in range(0, len(rows), batch_size):
+            pending.put(rows[start:start + batch_size])
+        pending.put(None)
+        writer.join()
+
+        if failed:
+            if KODI_MODE:
+                xbmc.log(f'[FreeTube] History import error: {str(failed[0])}', xbmc.LOGERROR)
+            return 0
+
+        self._invalidate_caches()
+        return len(rows)
 
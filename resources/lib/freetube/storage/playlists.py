@@ -18,9 +18,36 @@ import uuid
 try:
     import xbmc
     KODI_MODE = True
+
+    def _log_info(msg):
+        xbmc.log(msg, xbmc.LOGINFO)
+
+    def _log_error(msg):
+        xbmc.log(msg, xbmc.LOGERROR)
 except ImportError:
     KODI_MODE = False
 
+    def _log_info(msg):
+        pass
+
+    _log_error = _log_info
+
+
+# Precomputed UPDATE shapes for update_playlist, keyed by a bitmask of
+# the provided fields - same arrangement as profiles, so the few
+# distinct SQL strings stay hot in the statement cache
+_PLAYLIST_UPDATE_FIELDS = ('name', 'description')
+_SQL_UPDATE_PLAYLIST = {
+    mask: 'UPDATE playlists SET {}updated_at = ? WHERE playlist_id = ?'.format(
+        ''.join(
+            f'{field} = ?, '
+            for bit, field in enumerate(_PLAYLIST_UPDATE_FIELDS)
+            if mask & (1 << bit)
+        )
+    )
+    for mask in range(1, 1 << len(_PLAYLIST_UPDATE_FIELDS))
+}
+
 
 class PlaylistsManager:
     """Manage local playlists"""
@@ -55,13 +82,11 @@ class PlaylistsManager:
                 VALUES (?, ?, ?, ?, ?, ?)
             ''', (profile_id, playlist_id, name, description, now, now))
             
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Playlist created: {name} ({playlist_id})', xbmc.LOGINFO)
+            _log_info(f'[FreeTube] Playlist created: {name} ({playlist_id})')
             
             return playlist_id
         except Exception as e:
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Playlist create error: {str(e)}', xbmc.LOGERROR)
+            _log_error(f'[FreeTube] Playlist create error: {str(e)}')
             return None
     
     def update_playlist(self, playlist_id, name=None, description=None):
@@ -76,33 +101,29 @@ class PlaylistsManager:
         Returns:
             bool: True if updated successfully
         """
+        mask = (name is not None) | ((description is not None) << 1)
+        if not mask:
+            # Nothing to change; skip the write entirely
+            return True
+
         now = int(time.time())
-        
+
         try:
-            updates = []
             params = []
-            
+
             if name is not None:
-                updates.append('name = ?')
                 params.append(name)
-            
+
             if description is not None:
-                updates.append('description = ?')
                 params.append(description)
-            
-            updates.append('updated_at = ?')
-            params.append(now)
-            
-            params.append(playlist_id)
-            
-            if updates:
-                query = f'UPDATE playlists SET {", ".join(updates)} WHERE playlist_id = ?'
-                self.db.execute(query, tuple(params))
-            
+
+            params.extend((now, playlist_id))
+
+            self.db.execute(_SQL_UPDATE_PLAYLIST[mask], tuple(params))
+
             return True
         except Exception as e:
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Playlist update error: {str(e)}', xbmc.LOGERROR)
+            _log_error(f'[FreeTube] Playlist update error: {str(e)}')
             return False
     
     def delete_playlist(self, playlist_id):
@@ -118,13 +139,11 @@ class PlaylistsManager:
         try:
             self.db.execute('DELETE FROM playlists WHERE playlist_id = ?', (playlist_id,))
             
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Playlist deleted: {playlist_id}', xbmc.LOGINFO)
+            _log_info(f'[FreeTube] Playlist deleted: {playlist_id}')
             
             return True
         except Exception as e:
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Playlist delete error: {str(e)}', xbmc.LOGERROR)
+            _log_error(f'[FreeTube] Playlist delete error: {str(e)}')
             return False
     
     def get_playlist(self, playlist_id):
@@ -153,16 +172,22 @@ class PlaylistsManager:
         Returns:
             list: List of playlists
         """
+        # Correlated scalar subquery instead of LEFT JOIN + GROUP BY:
+        # the join materialized every playlist_videos row for the
+        # profile just to count them, while the subquery answers each
+        # count with a range scan on the playlist_id index
         result = self.db.execute('''
-            SELECT p.*, COUNT(pv.id) as video_count
+            SELECT p.*,
+                   (SELECT COUNT(*) FROM playlist_videos pv
+                    WHERE pv.playlist_id = p.playlist_id) as video_count
             FROM playlists p
-            LEFT JOIN playlist_videos pv ON p.playlist_id = pv.playlist_id
             WHERE p.profile_id = ?
-            GROUP BY p.playlist_id
             ORDER BY p.name ASC
         ''', (profile_id,))
-        
-        return [dict(row) for row in result]
+
+        # Rows are returned as-is; mapping access by column name works
+        # and nothing here needs a mutable dict
+        return result
     
     def add_video_to_playlist(self, playlist_id, video_id, title, author=None,
                              channel_id=None, length_seconds=None, thumbnail=None):
@@ -184,34 +209,78 @@ class PlaylistsManager:
         now = int(time.time())
         
         try:
-            # Get next position
+            # One round trip: the position subquery replaces the
+            # separate MAX(position) SELECT, and the AFTER INSERT
+            # trigger on playlist_videos handles the playlists
+            # updated_at bookkeeping
+            self.db.execute('''
+                INSERT OR IGNORE INTO playlist_videos
+                (playlist_id, video_id, title, author, channel_id, length_seconds,
+                 thumbnail, position, added_at)
+                SELECT ?, ?, ?, ?, ?, ?, ?,
+                       COALESCE((SELECT MAX(position) + 1 FROM playlist_videos
+                                 WHERE playlist_id = ?), 0),
+                       ?
+            ''', (playlist_id, video_id, title, author, channel_id, length_seconds,
+                 thumbnail, playlist_id, now))
+
+            return True
+        except Exception as e:
+            _log_error(f'[FreeTube] Playlist add video error: {str(e)}')
+            return False
+    
+    def add_videos_to_playlist(self, playlist_id, videos):
+        """
+        Add multiple videos to a playlist in one transaction
+
+        One MAX(position) lookup and one executemany instead of the
+        per-video path, so importing a long playlist costs two
+        statements rather than hundreds. Positions are pre-assigned
+        from the starting offset; the AFTER INSERT trigger keeps the
+        playlist's updated_at current.
+
+        Args:
+            playlist_id: Playlist ID
+            videos: List of video dicts with keys: video_id, title and
+                optionally author, channel_id, length_seconds, thumbnail
+
+        Returns:
+            int: Number of videos actually added (duplicates skipped)
+        """
+        now = int(time.time())
+
+        try:
             result = self.db.execute('''
                 SELECT COALESCE(MAX(position), -1) + 1 as next_pos
                 FROM playlist_videos
                 WHERE playlist_id = ?
             ''', (playlist_id,))
-            next_position = result[0]['next_pos'] if result else 0
-            
-            # Insert video
-            self.db.execute('''
+            base = result[0]['next_pos'] if result else 0
+
+            return self.db.execute_many('''
                 INSERT OR IGNORE INTO playlist_videos
-                (playlist_id, video_id, title, author, channel_id, length_seconds, 
+                (playlist_id, video_id, title, author, channel_id, length_seconds,
                  thumbnail, position, added_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (playlist_id, video_id, title, author, channel_id, length_seconds,
-                 thumbnail, next_position, now))
-            
-            # Update playlist timestamp
-            self.db.execute('''
-                UPDATE playlists SET updated_at = ? WHERE playlist_id = ?
-            ''', (now, playlist_id))
-            
-            return True
+            ''', [
+                (
+                    playlist_id,
+                    video['video_id'],
+                    video['title'],
+                    video.get('author'),
+                    video.get('channel_id'),
+                    video.get('length_seconds'),
+                    video.get('thumbnail'),
+                    base + idx,
+                    now
+                )
+                for idx, video in enumerate(videos)
+                if video.get('video_id') and video.get('title') is not None
+            ])
         except Exception as e:
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Playlist add video error: {str(e)}', xbmc.LOGERROR)
-            return False
-    
+            _log_error(f'[FreeTube] Playlist bulk add error: {str(e)}')
+            return 0
+
     def remove_video_from_playlist(self, playlist_id, video_id):
         """
         Remove video from playlist
@@ -231,19 +300,21 @@ class PlaylistsManager:
                 WHERE playlist_id = ? AND video_id = ?
             ''', (playlist_id, video_id))
             
-            # Reorder remaining videos
-            videos = self.db.execute('''
-                SELECT id FROM playlist_videos
+            # Close the gap in one set-based UPDATE: row_number() over
+            # the remaining rows recomputes every position in a single
+            # statement instead of a SELECT plus one UPDATE per video
+            self.db.execute('''
+                UPDATE playlist_videos SET position = (
+                    SELECT rn - 1 FROM (
+                        SELECT id, row_number() OVER (ORDER BY position) AS rn
+                        FROM playlist_videos
+                        WHERE playlist_id = ?
+                    ) ranked
+                    WHERE ranked.id = playlist_videos.id
+                )
                 WHERE playlist_id = ?
-                ORDER BY position ASC
-            ''', (playlist_id,))
-            
-            for idx, video in enumerate(videos):
-                self.db.execute('''
-                    UPDATE playlist_videos SET position = ?
-                    WHERE id = ?
-                ''', (idx, video['id']))
-            
+            ''', (playlist_id, playlist_id))
+
             # Update playlist timestamp
             self.db.execute('''
                 UPDATE playlists SET updated_at = ? WHERE playlist_id = ?
@@ -251,8 +322,7 @@ class PlaylistsManager:
             
             return True
         except Exception as e:
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Playlist remove video error: {str(e)}', xbmc.LOGERROR)
+            _log_error(f'[FreeTube] Playlist remove video error: {str(e)}')
             return False
     
     def get_playlist_videos(self, playlist_id, limit=None, offset=0):
@@ -280,9 +350,37 @@ class PlaylistsManager:
             params.extend([limit, offset])
         
         result = self.db.execute(query, tuple(params))
-        
-        return [dict(row) for row in result]
+
+        return result
     
+    def iter_playlist_videos(self, playlist_id, chunk_size=500):
+        """
+        Stream playlist videos in position order
+
+        Yields rows in fetchmany batches instead of materializing the
+        whole playlist, same arrangement as history's iter_history;
+        useful for export paths and very large playlists.
+
+        Args:
+            playlist_id: Playlist ID
+            chunk_size: Rows fetched per batch
+
+        Yields:
+            sqlite3.Row: Playlist video row
+        """
+        with self.db._get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT * FROM playlist_videos
+                WHERE playlist_id = ?
+                ORDER BY position ASC
+            ''', (playlist_id,))
+
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+
     def get_playlist_video_count(self, playlist_id):
         """
         Get video count in playlist
@@ -311,12 +409,16 @@ class PlaylistsManager:
         Returns:
             bool: True if video is in playlist
         """
+        # EXISTS stops at the first hit on the (playlist_id, video_id)
+        # unique index instead of counting matches
         result = self.db.execute('''
-            SELECT COUNT(*) as count FROM playlist_videos
-            WHERE playlist_id = ? AND video_id = ?
+            SELECT EXISTS(
+                SELECT 1 FROM playlist_videos
+                WHERE playlist_id = ? AND video_id = ?
+            ) as found
         ''', (playlist_id, video_id))
-        
-        return result[0]['count'] > 0 if result else False
+
+        return bool(result[0]['found']) if result else False
     
     def reorder_playlist_videos(self, playlist_id, video_ids_in_order):
         """
@@ -332,13 +434,18 @@ class PlaylistsManager:
         now = int(time.time())
         
         try:
-            for idx, video_id in enumerate(video_ids_in_order):
-                self.db.execute('''
-                    UPDATE playlist_videos
-                    SET position = ?
-                    WHERE playlist_id = ? AND video_id = ?
-                ''', (idx, playlist_id, video_id))
-            
+            # One prepared UPDATE driven by executemany in a single
+            # transaction; the per-video execute loop re-dispatched and
+            # committed N times for an N-video reorder
+            self.db.execute_many('''
+                UPDATE playlist_videos
+                SET position = ?
+                WHERE playlist_id = ? AND video_id = ?
+            ''', [
+                (idx, playlist_id, video_id)
+                for idx, video_id in enumerate(video_ids_in_order)
+            ])
+
             # Update playlist timestamp
             self.db.execute('''
                 UPDATE playlists SET updated_at = ? WHERE playlist_id = ?
@@ -346,8 +453,7 @@ class PlaylistsManager:
             
             return True
         except Exception as e:
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Playlist reorder error: {str(e)}', xbmc.LOGERROR)
+            _log_error(f'[FreeTube] Playlist reorder error: {str(e)}')
             return False
     
     def clear_playlist(self, playlist_id):
@@ -374,7 +480,6 @@ class PlaylistsManager:
             
             return True
         except Exception as e:
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Playlist clear error: {str(e)}', xbmc.LOGERROR)
+            _log_error(f'[FreeTube] Playlist clear error: {str(e)}')
             return False
 
@@ -18,9 +18,38 @@ import uuid
 try:
     import xbmc
     KODI_MODE = True
+
+    def _log_info(msg):
+        xbmc.log(msg, xbmc.LOGINFO)
+
+    def _log_error(msg):
+        xbmc.log(msg, xbmc.LOGERROR)
 except ImportError:
     KODI_MODE = False
 
+    def _log_info(msg):
+        pass
+
+    _log_error = _log_info
+
+
+# Every UPDATE shape update_profile can emit, keyed by a bitmask of
+# which fields are present. Precomputing the handful of variants at
+# import swaps per-call string building for a dict lookup and keeps the
+# SQL text identical across calls so the connection's statement cache
+# always hits.
+_PROFILE_UPDATE_FIELDS = ('name', 'color', 'is_default')
+_SQL_UPDATE_PROFILE = {
+    mask: 'UPDATE profiles SET {}updated_at = ? WHERE profile_id = ?'.format(
+        ''.join(
+            f'{field} = ?, '
+            for bit, field in enumerate(_PROFILE_UPDATE_FIELDS)
+            if mask & (1 << bit)
+        )
+    )
+    for mask in range(1, 1 << len(_PROFILE_UPDATE_FIELDS))
+}
+
 
 class ProfilesManager:
     """Manage user profiles"""
@@ -59,13 +88,11 @@ class ProfilesManager:
                 VALUES (?, ?, ?, ?, ?, ?)
             ''', (profile_id, name, color, 1 if is_default else 0, now, now))
             
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Profile created: {name} ({profile_id})', xbmc.LOGINFO)
+            _log_info(f'[FreeTube] Profile created: {name} ({profile_id})')
             
             return profile_id
         except Exception as e:
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Profile create error: {str(e)}', xbmc.LOGERROR)
+            _log_error(f'[FreeTube] Profile create error: {str(e)}')
             return None
     
     def update_profile(self, profile_id, name=None, color=None, is_default=None):
@@ -81,41 +108,39 @@ class ProfilesManager:
         Returns:
             bool: True if updated successfully
         """
+        mask = (
+            (name is not None)
+            | ((color is not None) << 1)
+            | ((is_default is not None) << 2)
+        )
+        if not mask:
+            # Nothing to change; skip the write entirely
+            return True
+
         now = int(time.time())
-        
+
         try:
-            # Build update query dynamically
-            updates = []
             params = []
-            
+
             if name is not None:
-                updates.append('name = ?')
                 params.append(name)
-            
+
             if color is not None:
-                updates.append('color = ?')
                 params.append(color)
-            
+
             if is_default is not None:
                 # Unset other defaults
                 if is_default:
                     self.db.execute('UPDATE profiles SET is_default = 0')
-                updates.append('is_default = ?')
                 params.append(1 if is_default else 0)
-            
-            updates.append('updated_at = ?')
-            params.append(now)
-            
-            params.append(profile_id)
-            
-            if updates:
-                query = f'UPDATE profiles SET {", ".join(updates)} WHERE profile_id = ?'
-                self.db.execute(query, tuple(params))
-            
+
+            params.extend((now, profile_id))
+
+            self.db.execute(_SQL_UPDATE_PROFILE[mask], tuple(params))
+
             return True
         except Exception as e:
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Profile update error: {str(e)}', xbmc.LOGERROR)
+            _log_error(f'[FreeTube] Profile update error: {str(e)}')
             return False
     
     def delete_profile(self, profile_id):
@@ -129,33 +154,32 @@ class ProfilesManager:
             bool: True if deleted successfully
         """
         try:
-            # Check if this is the only profile
-            profiles = self.get_all_profiles()
-            if len(profiles) <= 1:
+            # Check if this is the only profile; LIMIT 2 stops the scan
+            # at the second row instead of materializing every profile
+            # dict just to take len()
+            if len(self.db.execute('SELECT 1 FROM profiles LIMIT 2')) <= 1:
                 if KODI_MODE:
                     xbmc.log('[FreeTube] Cannot delete last profile', xbmc.LOGWARNING)
                 return False
-            
-            # Check if this is the default profile
-            is_default = self.db.execute('''
-                SELECT is_default FROM profiles WHERE profile_id = ?
-            ''', (profile_id,))
-            
+
             self.db.execute('DELETE FROM profiles WHERE profile_id = ?', (profile_id,))
-            
-            # If deleted profile was default, set another as default
-            if is_default and is_default[0]['is_default']:
-                remaining = self.get_all_profiles()
-                if remaining:
-                    self.update_profile(remaining[0]['profile_id'], is_default=True)
-            
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Profile deleted: {profile_id}', xbmc.LOGINFO)
+
+            # If the default was deleted, promote the earliest
+            # remaining profile in one statement; the NOT EXISTS guard
+            # makes this a no-op when a default still exists
+            self.db.execute('''
+                UPDATE profiles SET is_default = 1
+                WHERE profile_id = (
+                    SELECT profile_id FROM profiles ORDER BY created_at ASC LIMIT 1
+                )
+                AND NOT EXISTS (SELECT 1 FROM profiles WHERE is_default = 1)
+            ''')
+
+            _log_info(f'[FreeTube] Profile deleted: {profile_id}')
             
             return True
         except Exception as e:
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Profile delete error: {str(e)}', xbmc.LOGERROR)
+            _log_error(f'[FreeTube] Profile delete error: {str(e)}')
             return False
     
     def get_profile(self, profile_id):
@@ -201,8 +225,8 @@ class ProfilesManager:
         result = self.db.execute('''
             SELECT * FROM profiles ORDER BY name ASC
         ''')
-        
-        return [dict(row) for row in result]
+
+        return result
     
     def set_default_profile(self, profile_id):
         """
@@ -226,24 +250,23 @@ class ProfilesManager:
         Returns:
             dict: Profile statistics
         """
-        # Subscription count
-        sub_count = self.db.execute('''
-            SELECT COUNT(*) as count FROM subscriptions WHERE profile_id = ?
-        ''', (profile_id,))
-        
-        # History count
-        hist_count = self.db.execute('''
-            SELECT COUNT(*) as count FROM history WHERE profile_id = ?
-        ''', (profile_id,))
-        
-        # Playlist count
-        pl_count = self.db.execute('''
-            SELECT COUNT(*) as count FROM playlists WHERE profile_id = ?
-        ''', (profile_id,))
-        
+        # All three counts in one statement - one dispatch and one lock
+        # acquisition instead of three; each scalar subquery is an
+        # index-only count on its profile_id index
+        result = self.db.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM subscriptions WHERE profile_id = ?) as subscriptions,
+                (SELECT COUNT(*) FROM history WHERE profile_id = ?) as history,
+                (SELECT COUNT(*) FROM playlists WHERE profile_id = ?) as playlists
+        ''', (profile_id, profile_id, profile_id))
+
+        if not result:
+            return {'subscriptions': 0, 'history': 0, 'playlists': 0}
+
+        row = result[0]
         return {
-            'subscriptions': sub_count[0]['count'] if sub_count else 0,
-            'history': hist_count[0]['count'] if hist_count else 0,
-            'playlists': pl_count[0]['count'] if pl_count else 0,
+            'subscriptions': row['subscriptions'],
+            'history': row['history'],
+            'playlists': row['playlists'],
         }
 
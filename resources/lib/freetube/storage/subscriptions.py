@@ -12,14 +12,31 @@
 
 from __future__ import absolute_import, division, unicode_literals
 
+import csv
+import io
+import json
 import time
+from xml.sax.saxutils import quoteattr
+
+from .database import json_dumps
 
 try:
     import xbmc
     KODI_MODE = True
+
+    def _log_info(msg):
+        xbmc.log(msg, xbmc.LOGINFO)
+
+    def _log_error(msg):
+        xbmc.log(msg, xbmc.LOGERROR)
 except ImportError:
     KODI_MODE = False
 
+    def _log_info(msg):
+        pass
+
+    _log_error = _log_info
+
 
 class SubscriptionsManager:
     """Manage local channel subscriptions"""
@@ -55,13 +72,11 @@ class SubscriptionsManager:
                 VALUES (?, ?, ?, ?, ?)
             ''', (profile_id, channel_id, channel_name, channel_thumbnail, now))
             
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Subscribed to channel: {channel_name} ({channel_id})', xbmc.LOGINFO)
+            _log_info(f'[FreeTube] Subscribed to channel: {channel_name} ({channel_id})')
             
             return True
         except Exception as e:
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Subscribe error: {str(e)}', xbmc.LOGERROR)
+            _log_error(f'[FreeTube] Subscribe error: {str(e)}')
             return False
     
     def unsubscribe(self, profile_id, channel_id):
@@ -81,13 +96,11 @@ class SubscriptionsManager:
                 WHERE profile_id = ? AND channel_id = ?
             ''', (profile_id, channel_id))
             
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Unsubscribed from channel: {channel_id}', xbmc.LOGINFO)
+            _log_info(f'[FreeTube] Unsubscribed from channel: {channel_id}')
             
             return True
         except Exception as e:
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] Unsubscribe error: {str(e)}', xbmc.LOGERROR)
+            _log_error(f'[FreeTube] Unsubscribe error: {str(e)}')
             return False
     
     def is_subscribed(self, profile_id, channel_id):
@@ -101,13 +114,59 @@ class SubscriptionsManager:
         Returns:
             bool: True if subscribed
         """
+        # EXISTS stops at the first hit on the (profile_id, channel_id)
+        # unique index instead of counting matches
         result = self.db.execute('''
-            SELECT COUNT(*) as count FROM subscriptions 
-            WHERE profile_id = ? AND channel_id = ?
+            SELECT EXISTS(
+                SELECT 1 FROM subscriptions
+                WHERE profile_id = ? AND channel_id = ?
+            ) as found
         ''', (profile_id, channel_id))
-        
-        return result[0]['count'] > 0 if result else False
+
+        return bool(result[0]['found']) if result else False
     
+    def get_subscribed_ids(self, profile_id):
+        """
+        Get the set of subscribed channel IDs for a profile
+
+        One query instead of a per-channel is_subscribed round trip,
+        for render loops that check many channels.
+
+        Args:
+            profile_id: Profile ID
+
+        Returns:
+            frozenset: Subscribed channel IDs
+        """
+        result = self.db.execute('''
+            SELECT channel_id FROM subscriptions
+            WHERE profile_id = ?
+        ''', (profile_id,))
+
+        return frozenset(row['channel_id'] for row in result)
+
+    def get_subscriptions_brief(self, profile_id):
+        """
+        Get (channel_id, channel_name) pairs for a profile
+
+        Two-column tuples instead of full per-row dicts; the feed loop
+        only needs the id and display name, and skipping the dict
+        construction matters when enumerating large subscription lists.
+
+        Args:
+            profile_id: Profile ID
+
+        Returns:
+            list: (channel_id, channel_name) tuples, sorted by name
+        """
+        result = self.db.execute('''
+            SELECT channel_id, channel_name FROM subscriptions
+            WHERE profile_id = ?
+            ORDER BY channel_name ASC
+        ''', (profile_id,))
+
+        return [tuple(row) for row in result]
+
     def get_subscriptions(self, profile_id, sort_by='name'):
         """
         Get all subscriptions for a profile
@@ -126,9 +185,48 @@ class SubscriptionsManager:
             WHERE profile_id = ?
             ORDER BY {order_clause}
         ''', (profile_id,))
-        
-        return [dict(row) for row in result]
+
+        # sqlite3.Row supports row['column'] access directly; skipping
+        # the per-row dict copy avoids allocating every column twice
+        return result
     
+    def get_stale_subscriptions(self, profile_id, max_age_s):
+        """
+        Get subscriptions not refreshed within max_age_s
+
+        Served by the (profile_id, last_fetched) index, so feed builds
+        can skip channels fetched recently.
+
+        Args:
+            profile_id: Profile ID
+            max_age_s: Maximum age in seconds before a channel is stale
+
+        Returns:
+            list: Stale subscriptions
+        """
+        cutoff = int(time.time()) - max_age_s
+        result = self.db.execute('''
+            SELECT * FROM subscriptions
+            WHERE profile_id = ? AND last_fetched < ?
+            ORDER BY channel_name ASC
+        ''', (profile_id, cutoff))
+
+        return result
+
+    def update_last_fetched(self, profile_id, channel_ids):
+        """
+        Record that these channels' videos were just fetched
+
+        Args:
+            profile_id: Profile ID
+            channel_ids: Iterable of channel IDs
+        """
+        now = int(time.time())
+        self.db.execute_many('''
+            UPDATE subscriptions SET last_fetched = ?
+            WHERE profile_id = ? AND channel_id = ?
+        ''', [(now, profile_id, channel_id) for channel_id in channel_ids])
+
     def get_subscription_count(self, profile_id):
         """
         Get subscription count for a profile
@@ -157,13 +255,28 @@ class SubscriptionsManager:
         Returns:
             list: Matching subscriptions
         """
+        if getattr(self.db, 'subs_fts_enabled', False):
+            # Prefix phrase match against the inverted index; quoting
+            # the query keeps FTS operators in user input literal
+            match = '"{}"*'.format(query.replace('"', '""'))
+            try:
+                result = self.db.execute('''
+                    SELECT s.* FROM subscriptions s
+                    JOIN subscriptions_fts f ON s.id = f.rowid
+                    WHERE f.channel_name MATCH ? AND s.profile_id = ?
+                    ORDER BY s.channel_name ASC
+                ''', (match, profile_id))
+                return result
+            except Exception:
+                pass  # Fall back to the LIKE scan below
+
         result = self.db.execute('''
-            SELECT * FROM subscriptions 
+            SELECT * FROM subscriptions
             WHERE profile_id = ? AND channel_name LIKE ?
             ORDER BY channel_name ASC
         ''', (profile_id, f'%{query}%'))
-        
-        return [dict(row) for row in result]
+
+        return result
     
     def import_subscriptions(self, profile_id, channels, clear_existing=False):
         """
@@ -179,29 +292,39 @@ class SubscriptionsManager:
         """
         if clear_existing:
             self.db.execute('DELETE FROM subscriptions WHERE profile_id = ?', (profile_id,))
-        
+
         now = int(time.time())
-        imported = 0
-        
-        for channel in channels:
-            try:
-                self.db.execute('''
-                    INSERT OR IGNORE INTO subscriptions 
-                    (profile_id, channel_id, channel_name, channel_thumbnail, subscribed_at)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    profile_id,
-                    channel['channel_id'],
-                    channel['channel_name'],
-                    channel.get('channel_thumbnail'),
-                    now
-                ))
-                imported += 1
-            except Exception:
-                continue
-        
-        if KODI_MODE:
-            xbmc.log(f'[FreeTube] Imported {imported} subscriptions', xbmc.LOGINFO)
+
+        # One executemany in one transaction instead of a statement per
+        # channel - the INSERT is prepared once and commits once, which
+        # is what makes thousand-channel imports tolerable. rowcount
+        # excludes rows the OR IGNORE skipped, so the count reflects
+        # what was actually added. A generator feeds executemany so the
+        # importer dicts are turned into parameter tuples one at a time
+        # without an intermediate list.
+        rows = (
+            (
+                profile_id,
+                channel['channel_id'],
+                channel['channel_name'],
+                channel.get('channel_thumbnail'),
+                now
+            )
+            for channel in channels
+            if channel.get('channel_id') and channel.get('channel_name')
+        )
+
+        try:
+            imported = self.db.execute_many('''
+                INSERT OR IGNORE INTO subscriptions
+                (profile_id, channel_id, channel_name, channel_thumbnail, subscribed_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', rows)
+        except Exception as e:
+            _log_error(f'[FreeTube] Subscription import error: {str(e)}')
+            imported = 0
+
+        _log_info(f'[FreeTube] Imported {imported} subscriptions')
         
         return imported
     
@@ -217,44 +340,62 @@ class SubscriptionsManager:
             str or dict: Exported data
         """
         subscriptions = self.get_subscriptions(profile_id)
-        
+
         if format == 'freetube':
-            # FreeTube .db format (JSON lines)
-            return '\n'.join([
-                f'{{"channel_id": "{sub["channel_id"]}", "channel_name": "{sub["channel_name"]}", "channel_thumbnail": "{sub.get("channel_thumbnail", "")}"}}' 
+            # FreeTube .db format (JSON lines); json_dumps handles
+            # quotes and backslashes the old f-string template broke on
+            return '\n'.join(
+                json_dumps({
+                    'channel_id': sub['channel_id'],
+                    'channel_name': sub['channel_name'],
+                    'channel_thumbnail': sub['channel_thumbnail'] or ''
+                })
                 for sub in subscriptions
-            ])
-        
+            )
+
         elif format == 'youtube':
-            # YouTube CSV format
-            csv_lines = ['Channel Id,Channel Url,Channel Title']
-            for sub in subscriptions:
-                csv_lines.append(f'{sub["channel_id"]},https://www.youtube.com/channel/{sub["channel_id"]},{sub["channel_name"]}')
-            return '\n'.join(csv_lines)
-        
+            # YouTube CSV format; csv.writer quotes embedded commas and
+            # quotes in channel names and emits rows in C
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(['Channel Id', 'Channel Url', 'Channel Title'])
+            writer.writerows(
+                (
+                    sub['channel_id'],
+                    f'https://www.youtube.com/channel/{sub["channel_id"]}',
+                    sub['channel_name']
+                )
+                for sub in subscriptions
+            )
+            return buf.getvalue()
+
         elif format == 'opml':
-            # OPML format
+            # OPML format; quoteattr escapes <, & and quotes in channel
+            # names that would otherwise produce invalid XML
             opml = ['<?xml version="1.0" encoding="UTF-8"?>', '<opml version="1.1">', '<body>', '<outline text="YouTube Subscriptions" title="YouTube Subscriptions">']
-            for sub in subscriptions:
-                opml.append(f'<outline text="{sub["channel_name"]}" title="{sub["channel_name"]}" type="rss" xmlUrl="https://www.youtube.com/feeds/videos.xml?channel_id={sub["channel_id"]}" />')
+            opml.extend(
+                f'<outline text={quoteattr(sub["channel_name"])} title={quoteattr(sub["channel_name"])} type="rss" xmlUrl="https://www.youtube.com/feeds/videos.xml?channel_id={sub["channel_id"]}" />'
+                for sub in subscriptions
+            )
             opml.extend(['</outline>', '</body>', '</opml>'])
             return '\n'.join(opml)
-        
+
         elif format == 'newpipe':
-            # NewPipe JSON format
-            import json
+            # NewPipe JSON format; stdlib json for the indent= pretty
+            # printing NewPipe's importer expects
             newpipe_data = {
                 'app_version': '0.19.8',
                 'app_version_int': 953,
-                'subscriptions': []
+                'subscriptions': [
+                    {
+                        'service_id': 0,
+                        'url': f'https://www.youtube.com/channel/{sub["channel_id"]}',
+                        'name': sub['channel_name']
+                    }
+                    for sub in subscriptions
+                ]
             }
-            for sub in subscriptions:
-                newpipe_data['subscriptions'].append({
-                    'service_id': 0,
-                    'url': f'https://www.youtube.com/channel/{sub["channel_id"]}',
-                    'name': sub["channel_name"]
-                })
             return json.dumps(newpipe_data, indent=2)
-        
+
         return subscriptions
 
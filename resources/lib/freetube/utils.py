@@ -12,9 +12,19 @@
 from __future__ import absolute_import, division, unicode_literals
 
 import csv
+import io
 import json
+import os
+import re
 import xml.etree.ElementTree as ET
 
+from ._json import json_loads
+
+# Channel-id extraction from feed URLs, compiled once; one C-level
+# search per URL instead of chained str.split allocations
+_CID_QUERY_RE = re.compile(r'channel_id=([^&]+)')
+_CID_PATH_RE = re.compile(r'/channel/([^/?#]+)')
+
 try:
     import xbmc
     import xbmcgui
@@ -22,6 +32,24 @@ try:
 except ImportError:
     KODI_MODE = False
 
+if KODI_MODE:
+    # One Dialog for all the show_* helpers below - each was allocating
+    # a fresh C++ dialog per call - plus the constants their default
+    # arguments resolve, looked up once instead of per notification
+    _DIALOG = xbmcgui.Dialog()
+    _NOTIFICATION_INFO = xbmcgui.NOTIFICATION_INFO
+    _INPUT_ALPHANUM = xbmcgui.INPUT_ALPHANUM
+
+
+def _chan(channel_id, channel_name, channel_thumbnail=None):
+    """Build the channel dict every importer emits - one call site for
+    the interpreter to specialize instead of an inline copy per parser"""
+    return {
+        'channel_id': channel_id,
+        'channel_name': channel_name,
+        'channel_thumbnail': channel_thumbnail
+    }
+
 
 class SubscriptionImporter:
     """Import subscriptions from various formats"""
@@ -38,20 +66,16 @@ class SubscriptionImporter:
             list: List of channel dicts or None
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Detect format
-            if file_path.endswith('.csv'):
-                return SubscriptionImporter.parse_youtube_csv(content)
-            elif file_path.endswith('.db'):
-                return SubscriptionImporter.parse_freetube_db(content)
-            elif file_path.endswith(('.xml', '.opml')):
-                return SubscriptionImporter.parse_opml(content)
-            elif file_path.endswith('.json'):
-                return SubscriptionImporter.parse_json(content)
-            else:
+            ext = os.path.splitext(file_path)[1].lower()
+            spec = _IMPORT_DISPATCH.get(ext)
+            if spec is None:
                 return None
+
+            parser, wants_handle, open_kwargs = spec
+            with open(file_path, **open_kwargs) as f:
+                # Stream parsers consume the handle a line at a time;
+                # the DOM/JSON parsers need the whole document
+                return parser(f) if wants_handle else parser(f.read())
         
         except Exception as e:
             if KODI_MODE:
@@ -60,23 +84,51 @@ class SubscriptionImporter:
     
     @staticmethod
     def parse_youtube_csv(content):
-        """Parse YouTube subscription CSV"""
+        """Parse YouTube subscription CSV from a string"""
+        return SubscriptionImporter.parse_youtube_csv_stream(io.StringIO(content))
+
+    @staticmethod
+    def parse_youtube_csv_stream(lines):
+        """
+        Parse YouTube subscription CSV from an open file handle
+
+        csv.reader consumes the handle a line at a time, so large
+        takeout files never sit in memory as one string plus a line
+        list.
+        """
         channels = []
-        
+
         try:
-            lines = content.strip().split('\n')
-            reader = csv.DictReader(lines)
-            
+            # csv.reader + positional lookup instead of DictReader:
+            # the column indices are resolved once from the header, so
+            # the hot loop skips the per-row dict construction and the
+            # repeated fallback key lookups
+            reader = csv.reader(lines)
+            header = next(reader, None)
+            if not header:
+                return channels
+
+            def find_column(*names):
+                for name in names:
+                    if name in header:
+                        return header.index(name)
+                return -1
+
+            id_idx = find_column('Channel Id', 'Channel ID')
+            name_idx = find_column('Channel Title', 'Channel Name')
+            if id_idx < 0 or name_idx < 0:
+                return channels
+
+            max_idx = max(id_idx, name_idx)
             for row in reader:
-                channel_id = row.get('Channel Id') or row.get('Channel ID')
-                channel_name = row.get('Channel Title') or row.get('Channel Name')
-                
+                if len(row) <= max_idx:
+                    continue
+
+                channel_id = row[id_idx]
+                channel_name = row[name_idx]
+
                 if channel_id and channel_name:
-                    channels.append({
-                        'channel_id': channel_id,
-                        'channel_name': channel_name,
-                        'channel_thumbnail': None
-                    })
+                    channels.append(_chan(channel_id, channel_name))
         
         except Exception as e:
             if KODI_MODE:
@@ -86,38 +138,55 @@ class SubscriptionImporter:
     
     @staticmethod
     def parse_freetube_db(content):
-        """Parse FreeTube .db format (JSON lines)"""
+        """Parse FreeTube .db format (JSON lines) from a string"""
+        return SubscriptionImporter.parse_freetube_db_stream(content.splitlines())
+
+    @staticmethod
+    def parse_freetube_db_stream(lines):
+        """
+        Parse FreeTube .db format (JSON lines) from an iterable of lines
+
+        Takes an open file handle (or any line iterable) so large
+        exports never sit in memory twice - once as the file contents
+        and again as the split line list. Lines may be bytes or str;
+        the JSON codec accepts both, so a binary handle skips the
+        up-front decode of the whole file.
+        """
         channels = []
-        
-        try:
-            for line in content.strip().split('\n'):
-                if not line:
-                    continue
-                
-                data = json.loads(line)
-                
-                # Extract channel info
-                if 'id' in data:
-                    # FreeTube profile format
-                    subscriptions = data.get('subscriptions', [])
-                    for sub in subscriptions:
-                        channels.append({
-                            'channel_id': sub.get('id'),
-                            'channel_name': sub.get('name'),
-                            'channel_thumbnail': sub.get('thumbnail')
-                        })
-                elif 'channel_id' in data or 'id' in data:
-                    # Direct subscription format
-                    channels.append({
-                        'channel_id': data.get('channel_id') or data.get('id'),
-                        'channel_name': data.get('channel_name') or data.get('name'),
-                        'channel_thumbnail': data.get('channel_thumbnail') or data.get('thumbnail')
-                    })
-        
-        except Exception as e:
-            if KODI_MODE:
-                xbmc.log(f'[FreeTube] FreeTube DB parse error: {str(e)}', xbmc.LOGERROR)
-        
+
+        for raw in lines:
+            line = raw.strip()
+            if not line:
+                continue
+
+            # Fail lines, not files: decode errors are handled per
+            # line, so one corrupt record is logged and skipped
+            # instead of aborting the rows already parsed
+            try:
+                data = json_loads(line)
+            except ValueError:
+                if KODI_MODE:
+                    xbmc.log('[FreeTube] Skipping malformed .db line', xbmc.LOGWARNING)
+                continue
+
+            if not isinstance(data, dict):
+                continue
+
+            # Extract channel info
+            if 'id' in data:
+                # FreeTube profile format
+                subscriptions = data.get('subscriptions', [])
+                for sub in subscriptions:
+                    channels.append(_chan(sub.get('id'), sub.get('name'),
+                                          sub.get('thumbnail')))
+            elif 'channel_id' in data or 'id' in data:
+                # Direct subscription format
+                channels.append(_chan(
+                    data.get('channel_id') or data.get('id'),
+                    data.get('channel_name') or data.get('name'),
+                    data.get('channel_thumbnail') or data.get('thumbnail')
+                ))
+
         return channels
     
     @staticmethod
@@ -126,23 +195,22 @@ class SubscriptionImporter:
         channels = []
         
         try:
-            root = ET.fromstring(content)
-            
-            # Find all outline elements
-            for outline in root.findall('.//outline[@xmlUrl]'):
-                xml_url = outline.get('xmlUrl', '')
-                
-                # Extract channel ID from XML URL
-                if 'channel_id=' in xml_url:
-                    channel_id = xml_url.split('channel_id=')[1].split('&')[0]
-                    channel_name = outline.get('title') or outline.get('text')
-                    
-                    if channel_id and channel_name:
-                        channels.append({
-                            'channel_id': channel_id,
-                            'channel_name': channel_name,
-                            'channel_thumbnail': None
-                        })
+            # iterparse streams outline elements instead of building
+            # the whole DOM and walking it with XPath; clearing each
+            # element keeps memory flat on huge Feedly/Inoreader OPMLs
+            for _event, elem in ET.iterparse(io.StringIO(content), events=('end',)):
+                if elem.tag == 'outline':
+                    xml_url = elem.get('xmlUrl', '')
+
+                    # Extract channel ID from XML URL
+                    match = _CID_QUERY_RE.search(xml_url)
+                    if match:
+                        channel_id = match.group(1)
+                        channel_name = elem.get('title') or elem.get('text')
+
+                        if channel_id and channel_name:
+                            channels.append(_chan(channel_id, channel_name))
+                elem.clear()
         
         except Exception as e:
             if KODI_MODE:
@@ -156,24 +224,21 @@ class SubscriptionImporter:
         channels = []
         
         try:
-            data = json.loads(content)
+            data = json_loads(content)
             
             # NewPipe format
             if 'subscriptions' in data:
                 for sub in data['subscriptions']:
                     url = sub.get('url', '')
                     
-                    # Extract channel ID from URL
-                    channel_id = None
-                    if '/channel/' in url:
-                        channel_id = url.split('/channel/')[1].split('?')[0].split('/')[0]
-                    
+                    # Extract channel ID from URL; the compiled regex
+                    # replaces three chained splits and their
+                    # intermediate lists per subscription
+                    match = _CID_PATH_RE.search(url)
+                    channel_id = match.group(1) if match else None
+
                     if channel_id:
-                        channels.append({
-                            'channel_id': channel_id,
-                            'channel_name': sub.get('name', ''),
-                            'channel_thumbnail': None
-                        })
+                        channels.append(_chan(channel_id, sub.get('name', '')))
             
             # YouTube format (list of subscription objects)
             elif isinstance(data, list):
@@ -183,11 +248,11 @@ class SubscriptionImporter:
                     channel_id = resource_id.get('channelId')
                     
                     if channel_id:
-                        channels.append({
-                            'channel_id': channel_id,
-                            'channel_name': snippet.get('title', ''),
-                            'channel_thumbnail': snippet.get('thumbnails', {}).get('default', {}).get('url')
-                        })
+                        channels.append(_chan(
+                            channel_id,
+                            snippet.get('title', ''),
+                            snippet.get('thumbnails', {}).get('default', {}).get('url')
+                        ))
         
         except Exception as e:
             if KODI_MODE:
@@ -196,37 +261,65 @@ class SubscriptionImporter:
         return channels
 
 
+
+# Extension-to-parser dispatch for import_from_file: one hash lookup
+# instead of a suffix-check chain, and a single place to register new
+# formats. Entries are (parser, wants_handle, open() kwargs); newline=''
+# on the CSV entry leaves newline handling to the csv module, and .db
+# opens binary so each JSON line is decoded once inside the codec
+# instead of an up-front UTF-8 pass over the whole file.
+_IMPORT_DISPATCH = {
+    '.csv': (SubscriptionImporter.parse_youtube_csv_stream, True,
+             {'mode': 'r', 'encoding': 'utf-8', 'newline': ''}),
+    '.db': (SubscriptionImporter.parse_freetube_db_stream, True, {'mode': 'rb'}),
+    '.xml': (SubscriptionImporter.parse_opml, False, {'mode': 'r', 'encoding': 'utf-8'}),
+    '.opml': (SubscriptionImporter.parse_opml, False, {'mode': 'r', 'encoding': 'utf-8'}),
+    '.json': (SubscriptionImporter.parse_json, False, {'mode': 'r', 'encoding': 'utf-8'}),
+}
+
+
+# Shared constant for the common missing/zero case in format_duration
+_ZERO_DURATION = "0:00"
+
+
 def format_duration(seconds):
     """
     Format duration in seconds to human-readable string
-    
+
+    Called once per row when building listings, so the arithmetic uses
+    divmod - quotient and remainder in one call instead of a separate
+    division and modulo per unit.
+
     Args:
         seconds: Duration in seconds
-        
+
     Returns:
         str: Formatted duration (e.g., "1:23:45")
     """
     if not seconds:
-        return "0:00"
-    
-    seconds = int(seconds)
-    hours = seconds // 3600
-    minutes = (seconds % 3600) // 60
-    secs = seconds % 60
-    
+        return _ZERO_DURATION
+
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+
     if hours > 0:
         return f"{hours}:{minutes:02d}:{secs:02d}"
     else:
         return f"{minutes}:{secs:02d}"
 
 
+# Thresholds for format_number, largest first; one table walk instead
+# of a chain of literal comparisons, called once per rendered video card
+_NUMBER_SCALES = ((1000000000, 'B'), (1000000, 'M'), (1000, 'K'))
+
+
 def format_number(number):
     """
     Format large numbers with K/M/B suffixes
-    
+
     Args:
         number: Number to format
-        
+
     Returns:
         str: Formatted number
     """
@@ -234,15 +327,12 @@ def format_number(number):
         number = int(number)
     except (ValueError, TypeError):
         return "0"
-    
-    if number >= 1000000000:
-        return f"{number / 1000000000:.1f}B"
-    elif number >= 1000000:
-        return f"{number / 1000000:.1f}M"
-    elif number >= 1000:
-        return f"{number / 1000:.1f}K"
-    else:
-        return str(number)
+
+    for scale, suffix in _NUMBER_SCALES:
+        if number >= scale:
+            return f"{number / scale:.1f}{suffix}"
+
+    return str(number)
 
 
 def show_notification(title, message, icon=None, time_ms=5000):
@@ -259,9 +349,9 @@ def show_notification(title, message, icon=None, time_ms=5000):
         return
     
     if icon is None:
-        icon = xbmcgui.NOTIFICATION_INFO
+        icon = _NOTIFICATION_INFO
     
-    xbmcgui.Dialog().notification(title, message, icon, time_ms)
+    _DIALOG.notification(title, message, icon, time_ms)
 
 
 def show_text_input(heading, default=''):
@@ -278,7 +368,7 @@ def show_text_input(heading, default=''):
     if not KODI_MODE:
         return None
     
-    keyboard = xbmcgui.Dialog().input(heading, default, type=xbmcgui.INPUT_ALPHANUM)
+    keyboard = _DIALOG.input(heading, default, type=_INPUT_ALPHANUM)
     return keyboard if keyboard else None
 
 
@@ -296,7 +386,7 @@ def show_select_dialog(heading, items):
     if not KODI_MODE:
         return -1
     
-    return xbmcgui.Dialog().select(heading, items)
+    return _DIALOG.select(heading, items)
 
 
 def show_ok_dialog(heading, message):
@@ -310,7 +400,7 @@ def show_ok_dialog(heading, message):
     if not KODI_MODE:
         return
     
-    xbmcgui.Dialog().ok(heading, message)
+    _DIALOG.ok(heading, message)
 
 
 def show_yes_no_dialog(heading, message):
@@ -327,5 +417,5 @@ def show_yes_no_dialog(heading, message):
     if not KODI_MODE:
         return False
     
-    return xbmcgui.Dialog().yesno(heading, message)
+    return _DIALOG.yesno(heading, message)
 
@@ -17,17 +17,15 @@ except ImportError:
     from urlparse import parse_qs
 
 import xbmc
-import xbmcaddon
-import xbmcplugin
 
-from freetube.provider import FreeTubeProvider
+from freetube._kodi import get_addon
 
 
 def main():
     """Main plugin entry point"""
     try:
         # Get addon info
-        addon = xbmcaddon.Addon()
+        addon = get_addon()
         addon_handle = int(sys.argv[1])
         addon_url = sys.argv[0]
         
@@ -35,8 +33,17 @@ def main():
         params = parse_qs(sys.argv[2][1:]) if len(sys.argv) > 2 else {}
         
         xbmc.log('[FreeTube] Plugin started', xbmc.LOGINFO)
-        xbmc.log(f'[FreeTube] Params: {params}', xbmc.LOGDEBUG)
+        # Only build the params string when debug logging is on; this
+        # runs on every navigation click
+        if addon.getSetting('enable_debug_log') == 'true':
+            xbmc.log(f'[FreeTube] Params: {params}', xbmc.LOGDEBUG)
         
+        # Imported here rather than at module top: the provider pulls
+        # in the api clients, sqlite storage and cache layers, and Kodi
+        # spawns a fresh plugin process for every click - deferring the
+        # import keeps that cost off the module-load path
+        from freetube.provider import FreeTubeProvider
+
         # Initialize provider
         provider = FreeTubeProvider(addon_handle, addon_url)
         
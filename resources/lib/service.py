@@ -17,38 +17,66 @@ from __future__ import absolute_import, division, unicode_literals
 import time
 
 import xbmc
-import xbmcaddon
 
+from freetube._kodi import get_addon
+from freetube.cache import ResponseCache, get_response_cache
 from freetube.storage import Database
 from freetube.api import InnertubeClient, InvidiousClient
 
 
+class SettingsMonitor(xbmc.Monitor):
+    """Monitor that flags settings changes for the service loop"""
+
+    def __init__(self):
+        super().__init__()
+        self.settings_dirty = False
+
+    def onSettingsChanged(self):
+        self.settings_dirty = True
+
+
 class FreeTubeService:
     """Background service for FreeTube"""
     
     def __init__(self):
         """Initialize service"""
-        self.addon = xbmcaddon.Addon()
-        self.monitor = xbmc.Monitor()
+        self.addon = get_addon()
+        self.monitor = SettingsMonitor()
         self.db = Database()
+        self._load_settings()
         
         xbmc.log('[FreeTube Service] Started', xbmc.LOGINFO)
+
+    def _load_settings(self):
+        """
+        Snapshot addon settings into plain attributes
+
+        Each getSetting is a round trip into Kodi's core; reading the
+        handful of keys once here (and again only when the monitor
+        reports a change) keeps them out of every loop iteration.
+        """
+        get = self.addon.getSetting
+        self.api_backend = get('api_backend') or 'local'
+        self.invidious_instance = get('invidious_instance')
+        self.enable_auto_cleanup = get('enable_auto_cleanup') == 'true'
+        self.history_cleanup_days = int(get('history_cleanup_days') or '90')
+        self.search_cleanup_days = int(get('search_cleanup_days') or '30')
     
     def check_api_health(self):
         """Check if API is working, switch to fallback if needed"""
         try:
-            api_backend = self.addon.getSetting('api_backend') or 'local'
-            
-            if api_backend == 'local':
-                # Test Innertube API
+            if self.api_backend == 'local':
+                # Test Innertube API with a HEAD probe; fetching a
+                # whole trending page every hour just to check
+                # liveness wasted ~200KB per tick
                 client = InnertubeClient('web')
-                # Try to get trending as health check
-                client.get_trending()
+                if not client.ping():
+                    raise RuntimeError('Innertube unreachable')
                 xbmc.log('[FreeTube Service] Innertube API healthy', xbmc.LOGDEBUG)
             
-            elif api_backend == 'invidious':
+            elif self.api_backend == 'invidious':
                 # Test Invidious instance
-                instance_url = self.addon.getSetting('invidious_instance')
+                instance_url = self.invidious_instance
                 if instance_url:
                     client = InvidiousClient(instance_url=instance_url)
                     if not client.test_instance():
@@ -57,6 +85,7 @@ class FreeTubeService:
                         new_client = InvidiousClient.find_working_instance()
                         if new_client:
                             self.addon.setSetting('invidious_instance', new_client.instance_url)
+                            self.invidious_instance = new_client.instance_url
                             xbmc.log(f'[FreeTube Service] Switched to: {new_client.instance_url}', xbmc.LOGINFO)
         
         except Exception as e:
@@ -65,25 +94,29 @@ class FreeTubeService:
     def cleanup_old_data(self):
         """Clean up old data based on settings"""
         try:
-            # Check if auto-cleanup is enabled
-            enable_cleanup = self.addon.getSetting('enable_auto_cleanup') == 'true'
-            if not enable_cleanup:
+            # Expired cache entries are only skipped on read, never
+            # deleted - prune the API and listing namespaces here so
+            # the gzip files don't accumulate without bound on flash
+            # storage. Runs regardless of the auto-cleanup setting
+            # since it only removes entries already past their TTL.
+            # The provider ttl mirrors FreeTubeProvider.cache.
+            get_response_cache().prune()
+            ResponseCache(name='provider', ttl=600).prune()
+
+            if not self.enable_auto_cleanup:
                 return
             
-            # Get cleanup settings
-            history_days = int(self.addon.getSetting('history_cleanup_days') or '90')
-            search_days = int(self.addon.getSetting('search_cleanup_days') or '30')
-            
             # Calculate cutoff timestamps
             now = int(time.time())
-            history_cutoff = now - (history_days * 86400)
-            search_cutoff = now - (search_days * 86400)
-            
-            # Clean history
-            self.db.execute('DELETE FROM history WHERE watched_at < ?', (history_cutoff,))
+            history_cutoff = now - (self.history_cleanup_days * 86400)
+            search_cutoff = now - (self.search_cleanup_days * 86400)
             
-            # Clean search history
-            self.db.execute('DELETE FROM search_history WHERE searched_at < ?', (search_cutoff,))
+            # Both DELETEs in one transaction, sharing a single
+            # commit/fsync; each is an index range scan on its
+            # timestamp column
+            with self.db.transaction() as cursor:
+                cursor.execute('DELETE FROM history WHERE watched_at < ?', (history_cutoff,))
+                cursor.execute('DELETE FROM search_history WHERE searched_at < ?', (search_cutoff,))
             
             xbmc.log('[FreeTube Service] Data cleanup completed', xbmc.LOGINFO)
         
@@ -107,6 +140,12 @@ class FreeTubeService:
         
         while not self.monitor.abortRequested():
             current_time = time.time()
+
+            # Refresh the settings snapshot only when Kodi reported a
+            # change since the last iteration
+            if self.monitor.settings_dirty:
+                self.monitor.settings_dirty = False
+                self._load_settings()
             
             # Periodic health check
             if current_time - last_health_check > health_check_interval:
@@ -118,8 +157,17 @@ class FreeTubeService:
                 self.cleanup_old_data()
                 last_cleanup = current_time
             
-            # Sleep for 60 seconds (check abort every second)
-            if self.monitor.waitForAbort(60):
+            # Sleep until the next scheduled task instead of a fixed
+            # 60-second poll - ~26 wakeups a day rather than 1440.
+            # Capped at 10 minutes so settings changes still get
+            # picked up reasonably soon; waitForAbort itself returns
+            # immediately on shutdown regardless of the timeout.
+            sleep_s = max(1, min(
+                last_health_check + health_check_interval - current_time,
+                last_cleanup + cleanup_interval - current_time,
+                600
+            ))
+            if self.monitor.waitForAbort(sleep_s):
                 break
         
         xbmc.log('[FreeTube Service] Stopped', xbmc.LOGINFO)